@@ -6,17 +6,20 @@ Main entry point for the Voice Assistant application.
 import sys
 import argparse
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add the package to sys.path if running as script
 if __name__ == "__main__":
     sys.path.insert(0, str(Path(__file__).parent))
 
-from voice_assistant.core.factory import AssistantFactory
-from voice_assistant.core.exceptions import VoiceAssistantError
+if TYPE_CHECKING:
+    from voice_assistant.core.factory import AssistantFactory
 
+VERSION_TEXT = "Voice Assistant 1.0.0"
 
-def main():
-    """Main entry point for the Voice Assistant."""
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
     parser = argparse.ArgumentParser(
         description="Voice-Controlled Personal Assistant for Windows",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -61,14 +64,29 @@ Examples:
     )
     
     parser.add_argument(
-        "--version",
+        "-V", "--version",
         action="version",
-        version="Voice Assistant 1.0.0"
+        version=VERSION_TEXT
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main entry point for the Voice Assistant."""
+    # Answer version queries without building the argument parser
+    if len(sys.argv) == 2 and sys.argv[1] in ("--version", "-V"):
+        print(VERSION_TEXT)
+        return 0
+    
+    args = build_parser().parse_args()
+    
+    # Import heavy components only once a command actually needs them
+    from voice_assistant.core.exceptions import VoiceAssistantError
     
     try:
+        from voice_assistant.core.factory import AssistantFactory
+        
         # Create assistant factory
         factory = AssistantFactory(args.config)
         
@@ -107,7 +125,7 @@ Examples:
         return 1
 
 
-def test_configuration(factory: AssistantFactory) -> int:
+def test_configuration(factory: 'AssistantFactory') -> int:
     """Test configuration file."""
     try:
         print("Testing configuration...")
@@ -132,7 +150,7 @@ def test_configuration(factory: AssistantFactory) -> int:
         return 1
 
 
-def calibrate_microphone(factory: AssistantFactory) -> int:
+def calibrate_microphone(factory: 'AssistantFactory') -> int:
     """Calibrate microphone."""
     try:
         print("Calibrating microphone...")
@@ -160,21 +178,14 @@ def calibrate_microphone(factory: AssistantFactory) -> int:
         return 1
 
 
-def list_commands(factory: AssistantFactory) -> int:
+def list_commands(factory: 'AssistantFactory') -> int:
     """List all available commands."""
     try:
         print("Available Voice Commands:")
         print("=" * 50)
         
-        assistant = factory.create_assistant()
-        commands_info = assistant.get_commands_info()
-        
-        for handler_name, info in commands_info.items():
-            print(f"\n{handler_name}:")
-            print(f"  Description: {info['description']}")
-            print("  Patterns:")
-            for pattern in info['patterns']:
-                print(f"    - {pattern}")
+        # The registry alone is enough; no need to open the microphone
+        print(factory.command_registry.list_commands_text())
         
         print("\nNote: Use commands in Bahasa Indonesia as shown above.")
         return 0
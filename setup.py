@@ -2,35 +2,31 @@
 Setup script for Voice Assistant package.
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup
 from pathlib import Path
 
 # Read the README file
 readme_file = Path(__file__).parent / "README.md"
 long_description = readme_file.read_text(encoding="utf-8") if readme_file.exists() else ""
 
-# Read requirements
-requirements_file = Path(__file__).parent / "requirements.txt"
-if requirements_file.exists():
-    with open(requirements_file, "r", encoding="utf-8") as f:
-        requirements = [
-            line.strip() 
-            for line in f 
-            if line.strip() and not line.startswith("#")
-        ]
-        # Filter out development dependencies
-        requirements = [
-            req for req in requirements 
-            if not any(dev_pkg in req for dev_pkg in ['pytest', 'mypy', 'black', 'flake8', 'isort', 'sphinx'])
-        ]
-else:
-    requirements = [
-        "SpeechRecognition>=3.10.0",
-        "PyAudio>=0.2.11",
-        "tinytuya>=1.12.0",
-        "PyAutoGUI>=0.9.54",
-        "psutil>=5.9.0",
-    ]
+# Runtime requirements (development tools live in extras_require)
+_INSTALL_REQUIRES = (
+    "SpeechRecognition>=3.10.0",
+    "PyAudio>=0.2.11",
+    "tinytuya>=1.12.0",
+    "PyAutoGUI>=0.9.54",
+    "psutil>=5.9.0",
+)
+
+# Listed explicitly so builds do not walk the source tree
+_PACKAGES = [
+    "voice_assistant",
+    "voice_assistant.commands",
+    "voice_assistant.config",
+    "voice_assistant.core",
+    "voice_assistant.services",
+    "voice_assistant.tests",
+]
 
 setup(
     name="voice-assistant",
@@ -41,7 +37,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/username/voice-assistant",
-    packages=find_packages(),
+    packages=_PACKAGES,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: End Users/Desktop",
@@ -56,17 +52,22 @@ setup(
         "Operating System :: Microsoft :: Windows",
     ],
     python_requires=">=3.8",
-    install_requires=requirements,
+    install_requires=list(_INSTALL_REQUIRES),
     extras_require={
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
             "pytest-mock>=3.10.0",
+            "pytest-xdist>=3.0.0",
             "mypy>=1.0.0",
             "black>=22.0.0",
             "flake8>=5.0.0",
             "isort>=5.10.0",
         ],
+        "fast": [
+            "mss>=9.0.0",
+            "orjson>=3.9.0",
+        ],
         "docs": [
             "sphinx>=5.0.0",
             "sphinx-rtd-theme>=1.0.0",
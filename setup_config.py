@@ -3,7 +3,6 @@
 Setup script to initialize configuration for Voice Assistant.
 """
 
-import shutil
 import os
 from pathlib import Path
 
@@ -27,8 +26,8 @@ def setup_configuration():
         # Ensure config directory exists
         actual_config.parent.mkdir(exist_ok=True)
         
-        # Copy sample to actual config
-        shutil.copy2(sample_config, actual_config)
+        # Copy sample contents only (not its timestamps or permission bits)
+        actual_config.write_bytes(sample_config.read_bytes())
         
         print("✅ Configuration setup complete!")
         print(f"📝 Please edit {actual_config} with your settings:")
@@ -8,7 +8,23 @@ __version__ = "1.0.0"
 __author__ = "AI Assistant"
 __email__ = "assistant@example.com"
 
-from .core.assistant import VoiceAssistant
+import importlib
+
 from .core.exceptions import VoiceAssistantError
 
-__all__ = ["VoiceAssistant", "VoiceAssistantError"]
\ No newline at end of file
+_LAZY = {
+    "VoiceAssistant": ".core.assistant",
+}
+
+__all__ = ["VoiceAssistant", "VoiceAssistantError"]
+
+
+def __getattr__(name: str):
+    """Import heavy components on first access."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module = importlib.import_module(_LAZY[name], __name__)
+    obj = getattr(module, name)
+    globals()[name] = obj
+    return obj
\ No newline at end of file
@@ -1,13 +1,21 @@
 """
 Command handlers for the Voice Assistant.
+
+Concrete handlers are loaded lazily on first attribute access so that
+importing the package does not pull in their heavy dependencies.
 """
 
+import importlib
+
 from .base import Command, CommandRegistry
-from .system_commands import SystemControlCommand
-from .browser_commands import BrowserCommand
-from .application_commands import ApplicationCommand
-from .smart_device_commands import SmartDeviceCommand
-from .utility_commands import UtilityCommand
+
+_LAZY = {
+    "SystemControlCommand": ".system_commands",
+    "BrowserCommand": ".browser_commands",
+    "ApplicationCommand": ".application_commands",
+    "SmartDeviceCommand": ".smart_device_commands",
+    "UtilityCommand": ".utility_commands",
+}
 
 __all__ = [
     "Command",
@@ -17,4 +25,15 @@ __all__ = [
     "ApplicationCommand",
     "SmartDeviceCommand",
     "UtilityCommand"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    """Import command handlers on first access."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module = importlib.import_module(_LAZY[name], __name__)
+    obj = getattr(module, name)
+    globals()[name] = obj
+    return obj
\ No newline at end of file
@@ -2,56 +2,106 @@
 Application launcher commands implementation.
 """
 
-import subprocess
+import os
 import re
-from typing import Any, Dict, Optional
+import shlex
+import sys
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 from .base import Command
 from ..core.exceptions import ApplicationLaunchError
 from ..config.settings import ConfigManager
 
+_APP_RE = re.compile(r'jalankan aplikasi (.+)')
+
+# Default application mappings
+_DEFAULT_APPS = MappingProxyType({
+    'notepad': 'notepad.exe',
+    'calculator': 'calc.exe',
+    'paint': 'mspaint.exe',
+    'task manager': 'taskmgr.exe',
+    'control panel': 'control.exe',
+    'command prompt': 'cmd.exe',
+    'powershell': 'powershell.exe',
+    'registry editor': 'regedit.exe',
+    'system information': 'msinfo32.exe',
+    'device manager': 'devmgmt.msc',
+    'disk management': 'diskmgmt.msc',
+    'event viewer': 'eventvwr.msc',
+    'services': 'services.msc'
+})
+
+# Common application name variations
+_NAME_MAPPINGS = MappingProxyType({
+    'vs code': 'code',
+    'visual studio code': 'code',
+    'vscode': 'code',
+    'chrome': 'chrome.exe',
+    'google chrome': 'chrome.exe',
+    'firefox': 'firefox.exe',
+    'mozilla firefox': 'firefox.exe',
+    'edge': 'msedge.exe',
+    'microsoft edge': 'msedge.exe',
+    'word': 'winword.exe',
+    'microsoft word': 'winword.exe',
+    'excel': 'excel.exe',
+    'microsoft excel': 'excel.exe',
+    'powerpoint': 'powerpnt.exe',
+    'microsoft powerpoint': 'powerpnt.exe',
+    'outlook': 'outlook.exe',
+    'microsoft outlook': 'outlook.exe',
+    'teams': 'teams.exe',
+    'microsoft teams': 'teams.exe',
+    'skype': 'skype.exe',
+    'discord': 'discord.exe',
+    'spotify': 'spotify.exe',
+    'steam': 'steam.exe',
+    'vlc': 'vlc.exe',
+    'media player': 'vlc.exe',
+    'photoshop': 'photoshop.exe',
+    'adobe photoshop': 'photoshop.exe',
+    'illustrator': 'illustrator.exe',
+    'adobe illustrator': 'illustrator.exe'
+})
+
+# Single lookup table for all built-in names
+_STATIC_APPS = MappingProxyType({**_DEFAULT_APPS, **_NAME_MAPPINGS})
+
 
 class ApplicationCommand(Command):
     """Handler for application launcher commands."""
     
+    __slots__ = ("config_manager", "default_apps")
+    
+    COMMAND_PATTERNS: tuple[str, ...] = ("jalankan aplikasi *",)
+    DESCRIPTION = "Launch desktop applications by name"
+    
+    _PATTERN_RE = re.compile(r'jalankan aplikasi', re.IGNORECASE)
+    
     def __init__(self, config_manager: ConfigManager, logger: Optional = None):
         super().__init__(logger)
         self.config_manager = config_manager
-        
-        # Default application mappings
-        self.default_apps = {
-            'notepad': 'notepad.exe',
-            'calculator': 'calc.exe',
-            'paint': 'mspaint.exe',
-            'task manager': 'taskmgr.exe',
-            'control panel': 'control.exe',
-            'command prompt': 'cmd.exe',
-            'powershell': 'powershell.exe',
-            'registry editor': 'regedit.exe',
-            'system information': 'msinfo32.exe',
-            'device manager': 'devmgmt.msc',
-            'disk management': 'diskmgmt.msc',
-            'event viewer': 'eventvwr.msc',
-            'services': 'services.msc'
-        }
+        self.default_apps = _DEFAULT_APPS
     
     @property
-    def command_patterns(self) -> list[str]:
-        return ["jalankan aplikasi *"]
+    def command_patterns(self) -> tuple[str, ...]:
+        return self.COMMAND_PATTERNS
     
     @property
     def description(self) -> str:
-        return "Launch desktop applications by name"
+        return self.DESCRIPTION
     
     def can_handle(self, command: str) -> bool:
         """Check if this command can handle the given input."""
-        return "jalankan aplikasi" in command.lower()
+        return self._PATTERN_RE.search(command) is not None
     
     def execute(self, command: str, context: Optional[Dict[str, Any]] = None) -> Any:
         """Execute application launch command."""
         try:
             # Extract application name using regex
-            app_match = re.search(r'jalankan aplikasi (.+)', command.lower())
+            app_match = _APP_RE.search(command.lower())
             if not app_match:
                 raise ApplicationLaunchError("Could not extract application name from command")
             
@@ -61,96 +111,55 @@ class ApplicationCommand(Command):
             
             return self._launch_application(app_name)
             
+        except ApplicationLaunchError as e:
+            self.logger.error(f"Error executing application command '{command}': {e}")
+            raise
         except Exception as e:
             self.logger.error(f"Error executing application command '{command}': {e}")
-            raise ApplicationLaunchError(f"Failed to execute application command: {e}")
+            raise ApplicationLaunchError(f"Failed to execute application command: {e}") from e
     
     def _launch_application(self, app_name: str) -> str:
         """Launch application by name."""
+        import subprocess
+        
+        executable = self._get_executable_name(app_name)
+        self.logger.info(f"Launching application: {executable}")
+        
+        # Launch directly instead of through an extra cmd.exe shell
         try:
-            # Get executable name
-            executable = self._get_executable_name(app_name)
-            
-            self.logger.info(f"Launching application: {executable}")
-            
-            # Try to launch the application
-            process = subprocess.Popen(
-                executable,
-                shell=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            
-            # Check if process started successfully
-            if process.poll() is None or process.returncode == 0:
-                return f"Launched application: {app_name}"
+            if os.name == 'nt':
+                # ShellExecute resolves .exe, .msc and App Paths entries natively,
+                # but takes the arguments of shortcuts like "code --new-window" separately
+                program, *arguments = shlex.split(executable, posix=False)
+                if not arguments:
+                    os.startfile(program.strip('"'))
+                elif sys.version_info >= (3, 10):
+                    os.startfile(program.strip('"'), arguments=" ".join(arguments))
+                else:
+                    # startfile() has no arguments parameter before 3.10;
+                    # CreateProcess splits the command line itself
+                    subprocess.Popen(executable)
             else:
-                raise ApplicationLaunchError(f"Application failed to start: {app_name}")
-                
-        except FileNotFoundError:
-            raise ApplicationLaunchError(f"Application not found: {app_name}")
-        except Exception as e:
-            raise ApplicationLaunchError(f"Failed to launch application '{app_name}': {e}")
+                subprocess.Popen(
+                    shlex.split(executable),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+        except FileNotFoundError as e:
+            raise ApplicationLaunchError(f"Application not found: {app_name}") from e
+        
+        return f"Launched application: {app_name}"
     
     def _get_executable_name(self, app_name: str) -> str:
         """Get executable name for application."""
         app_name_lower = app_name.lower()
         
-        # Check config manager shortcuts first
-        config_executable = self.config_manager.get_application_command(app_name_lower)
-        if config_executable:
-            return config_executable
-        
-        # Check default mappings
-        if app_name_lower in self.default_apps:
-            return self.default_apps[app_name_lower]
-        
-        # Handle common application name variations
-        name_mappings = {
-            'vs code': 'code',
-            'visual studio code': 'code',
-            'vscode': 'code',
-            'chrome': 'chrome.exe',
-            'google chrome': 'chrome.exe',
-            'firefox': 'firefox.exe',
-            'mozilla firefox': 'firefox.exe',
-            'edge': 'msedge.exe',
-            'microsoft edge': 'msedge.exe',
-            'word': 'winword.exe',
-            'microsoft word': 'winword.exe',
-            'excel': 'excel.exe',
-            'microsoft excel': 'excel.exe',
-            'powerpoint': 'powerpnt.exe',
-            'microsoft powerpoint': 'powerpnt.exe',
-            'outlook': 'outlook.exe',
-            'microsoft outlook': 'outlook.exe',
-            'teams': 'teams.exe',
-            'microsoft teams': 'teams.exe',
-            'skype': 'skype.exe',
-            'discord': 'discord.exe',
-            'spotify': 'spotify.exe',
-            'steam': 'steam.exe',
-            'vlc': 'vlc.exe',
-            'media player': 'vlc.exe',
-            'photoshop': 'photoshop.exe',
-            'adobe photoshop': 'photoshop.exe',
-            'illustrator': 'illustrator.exe',
-            'adobe illustrator': 'illustrator.exe'
-        }
-        
-        if app_name_lower in name_mappings:
-            return name_mappings[app_name_lower]
-        
-        # Try common executable patterns
-        common_patterns = [
-            f"{app_name_lower}.exe",
-            f"{app_name_lower.replace(' ', '')}.exe",
-            f"{app_name_lower.replace(' ', '_')}.exe",
-            f"{app_name_lower.replace(' ', '-')}.exe"
-        ]
-        
-        # Return the first pattern (most likely to work)
-        return common_patterns[0]
+        # Config shortcuts take precedence over the built-in table
+        return (
+            self.config_manager.get_application_command(app_name_lower)
+            or _STATIC_APPS.get(app_name_lower)
+            or f"{app_name_lower}.exe"
+        )
     
     def add_application_shortcut(self, name: str, executable: str) -> None:
         """Add a new application shortcut to config."""
@@ -176,8 +185,13 @@ class ApplicationCommand(Command):
             self.logger.error(f"Failed to remove application shortcut: {e}")
             raise ApplicationLaunchError(f"Failed to remove application shortcut: {e}")
     
-    def list_application_shortcuts(self) -> Dict[str, str]:
-        """List all available application shortcuts."""
-        shortcuts = self.config_manager.config.application_shortcuts.copy()
-        shortcuts.update(self.default_apps)
-        return shortcuts
\ No newline at end of file
+    def list_application_shortcuts(self, copy: bool = False) -> Mapping[str, str]:
+        """List all available application shortcuts.
+        
+        Returns a read-only view where config shortcuts shadow the defaults,
+        or a plain dict snapshot when ``copy`` is True.
+        """
+        shortcuts = ChainMap(self.config_manager.config.application_shortcuts, self.default_apps)
+        if copy:
+            return dict(shortcuts)
+        return MappingProxyType(shortcuts)
\ No newline at end of file
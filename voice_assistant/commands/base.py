@@ -3,8 +3,9 @@ Base command interface and abstract classes.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Pattern, Union
 import logging
+import re
 
 from ..core.exceptions import CommandExecutionError
 
@@ -12,6 +13,12 @@ from ..core.exceptions import CommandExecutionError
 class Command(ABC):
     """Abstract base class for all voice commands."""
     
+    __slots__ = ("logger",)
+    
+    # Literal phrases that start this handler's commands; derived from
+    # command_patterns (text before the first '*') when left empty
+    trigger_prefixes: tuple[str, ...] = ()
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(self.__class__.__name__)
     
@@ -27,8 +34,8 @@ class Command(ABC):
     
     @property
     @abstractmethod
-    def command_patterns(self) -> list[str]:
-        """Return list of command patterns this handler supports."""
+    def command_patterns(self) -> tuple[str, ...]:
+        """Return the command patterns this handler supports."""
         pass
     
     @property
@@ -42,44 +49,183 @@ class CommandRegistry:
     """Registry for managing command handlers."""
     
     def __init__(self, wake_word: str = "peter"):
-        self._commands: list[Command] = []
+        self._commands: Union[list[Command], tuple[Command, ...]] = []
+        self._frozen = False
+        self._dispatch_re: Optional[Pattern[str]] = None
+        self._dispatch_targets: list[Command] = []
+        self._prefix_table: Dict[str, Command] = {}
+        self._pattern_info: Dict[Command, tuple[tuple[str, ...], str]] = {}
+        self._info_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._info_text_cache: Optional[str] = None
         self.wake_word = wake_word.lower()
+        self._wake_len = len(self.wake_word)
         self.logger = logging.getLogger(self.__class__.__name__)
     
+    @staticmethod
+    def _declared_patterns(command: Command) -> list[str]:
+        """Get the handler's command patterns, skipping anything that is not a string."""
+        try:
+            patterns = list(command.command_patterns)
+        except TypeError:
+            # Handlers without iterable patterns are only reachable through can_handle()
+            return []
+        return [pattern for pattern in patterns if isinstance(pattern, str)]
+    
+    @classmethod
+    def _trigger_prefixes(cls, command: Command) -> list[str]:
+        """Get the literal trigger text of each command pattern (up to the first '*')."""
+        declared = getattr(command, 'trigger_prefixes', ())
+        if isinstance(declared, tuple) and declared:
+            return [prefix.strip().lower() for prefix in declared if prefix.strip()]
+        
+        prefixes = []
+        for pattern in cls._declared_patterns(command):
+            prefix = pattern.split('*', 1)[0].strip().lower()
+            if prefix:
+                prefixes.append(prefix)
+        return prefixes
+    
+    @classmethod
+    def _trie_pattern(cls, node: Dict[str, Any]) -> str:
+        """Render a character trie as a regex; terminals are empty named groups."""
+        branches = [
+            re.escape(char) + cls._trie_pattern(child)
+            for char, child in node.items() if char
+        ]
+        if '' in node:
+            # Listed last so a longer trigger sharing this prefix is tried first
+            branches.append(f"(?P<g{node['']}>)")
+        if len(branches) == 1:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})"
+    
+    def _rebuild_dispatch(self) -> None:
+        """Rebuild the trigger lookup structures used by _find_handler.
+        
+        All trigger phrases are merged into one character trie and compiled
+        to a single regex, so shared prefixes ("buka youtube", "buka website")
+        are only matched once per position of the scanned command.
+        """
+        trie: Dict[str, Any] = {}
+        self._dispatch_targets = []
+        self._prefix_table = {}
+        for handler in self._commands:
+            for prefix in self._trigger_prefixes(handler):
+                node = trie
+                for char in prefix:
+                    node = node.setdefault(char, {})
+                if '' not in node:
+                    # Earlier registrations win on identical triggers
+                    node[''] = len(self._dispatch_targets)
+                    self._dispatch_targets.append(handler)
+                
+                # Key on the first one or two words; earlier registrations win
+                key = " ".join(prefix.split()[:2])
+                self._prefix_table.setdefault(key, handler)
+        
+        self._dispatch_re = re.compile(self._trie_pattern(trie)) if trie else None
+    
     def register(self, command: Command) -> None:
         """Register a command handler."""
-        self._commands.append(command)
-        self.logger.info(f"Registered command handler: {command.__class__.__name__}")
+        self.register_all([command])
+    
+    def register_all(self, commands: list[Command]) -> None:
+        """Register several command handlers, building the dispatch tables once."""
+        if self._frozen:
+            names = ", ".join(command.__class__.__name__ for command in commands)
+            raise CommandExecutionError(
+                f"Cannot register {names}: command registry is frozen"
+            )
+        
+        for command in commands:
+            self._commands.append(command)
+            self._pattern_info[command] = (
+                tuple(f"{self.wake_word} {pattern}" for pattern in self._declared_patterns(command)),
+                command.description
+            )
+        self._rebuild_dispatch()
+        self._invalidate_info_cache()
+        for command in commands:
+            self.logger.info(f"Registered command handler: {command.__class__.__name__}")
     
     def unregister(self, command: Command) -> None:
         """Unregister a command handler."""
+        if self._frozen:
+            raise CommandExecutionError(
+                f"Cannot unregister {command.__class__.__name__}: command registry is frozen"
+            )
+        
         if command in self._commands:
             self._commands.remove(command)
+            self._pattern_info.pop(command, None)
+            self._rebuild_dispatch()
+            self._invalidate_info_cache()
             self.logger.info(f"Unregistered command handler: {command.__class__.__name__}")
     
+    def _invalidate_info_cache(self) -> None:
+        """Drop cached command listings after the handler set changes."""
+        self._info_cache = None
+        self._info_text_cache = None
+    
+    def freeze(self) -> None:
+        """Make the handler list immutable once all handlers are registered."""
+        self._commands = tuple(self._commands)
+        self._frozen = True
+    
+    @property
+    def is_frozen(self) -> bool:
+        """Check if the registry has been frozen."""
+        return self._frozen
+    
+    def _normalize(self, command: str) -> tuple[str, Optional[str]]:
+        """Lowercase a command once and split off the wake word.
+        
+        Returns the normalized command and the actual command without the wake
+        word, or None in place of the latter when the wake word is missing.
+        """
+        command_lower = command.lower().strip()
+        if command_lower.startswith(self.wake_word):
+            return command_lower, command_lower[self._wake_len:].strip()
+        return command_lower, None
+    
     def has_wake_word(self, command: str) -> bool:
         """Check if command starts with the wake word."""
-        command_lower = command.lower().strip()
-        return command_lower.startswith(self.wake_word)
+        return self._normalize(command)[1] is not None
     
     def remove_wake_word(self, command: str) -> str:
         """Remove wake word from command and return the actual command."""
-        command_lower = command.lower().strip()
-        if command_lower.startswith(self.wake_word):
-            # Remove wake word and any extra spaces
-            actual_command = command_lower[len(self.wake_word):].strip()
-            return actual_command
-        return command_lower
+        command_lower, actual_command = self._normalize(command)
+        return command_lower if actual_command is None else actual_command
     
     def get_handler(self, command: str) -> Optional[Command]:
         """Get the appropriate command handler for a command."""
-        # First check if command has wake word
-        if not self.has_wake_word(command):
+        _, actual_command = self._normalize(command)
+        if actual_command is None:
             return None
-            
-        # Remove wake word and get actual command
-        actual_command = self.remove_wake_word(command)
+        return self._find_handler(actual_command)
+    
+    def _find_handler(self, actual_command: str) -> Optional[Command]:
+        """Find the handler for an already lowercased command without wake word."""
+        # Fast path: commands usually start with their trigger phrase
+        parts = actual_command.split(None, 2)
+        if parts:
+            handler = None
+            if len(parts) >= 2:
+                handler = self._prefix_table.get(f"{parts[0]} {parts[1]}")
+            if handler is None:
+                handler = self._prefix_table.get(parts[0])
+            if handler is not None and handler.can_handle(actual_command):
+                return handler
+        
+        # Trigger phrase elsewhere in the command: one regex scan over all triggers
+        if self._dispatch_re is not None:
+            match = self._dispatch_re.search(actual_command)
+            if match:
+                handler = self._dispatch_targets[int(match.lastgroup[1:])]
+                if handler.can_handle(actual_command):
+                    return handler
         
+        # Fall back to asking every handler (covers keywords outside the patterns)
         for cmd_handler in self._commands:
             if cmd_handler.can_handle(actual_command):
                 return cmd_handler
@@ -87,32 +233,62 @@ class CommandRegistry:
     
     def execute_command(self, command: str, context: Optional[Dict[str, Any]] = None) -> Any:
         """Execute a command using the appropriate handler."""
-        # Check for wake word first
-        if not self.has_wake_word(command):
+        # Lowercase and strip the wake word once for lookup and execution
+        _, actual_command = self._normalize(command)
+        if actual_command is None:
             raise CommandExecutionError(f"Command must start with wake word '{self.wake_word}': {command}")
-            
-        handler = self.get_handler(command)
+        
+        handler = self._find_handler(actual_command)
         if handler is None:
             raise CommandExecutionError(f"No handler found for command: {command}")
         
-        # Remove wake word before executing
-        actual_command = self.remove_wake_word(command)
-        
         try:
             return handler.execute(actual_command, context)
         except Exception as e:
             self.logger.error(f"Error executing command '{command}': {e}")
             raise CommandExecutionError(f"Failed to execute command: {e}")
     
+    @property
+    def patterns(self) -> list[str]:
+        """All registered command patterns, prefixed with the wake word."""
+        return [
+            pattern
+            for cmd_handler in self._commands
+            for pattern in self._pattern_info[cmd_handler][0]
+        ]
+    
+    def _command_info(self) -> Dict[str, Dict[str, Any]]:
+        """Get the cached command listing, rebuilt after the handler set changes."""
+        if self._info_cache is None:
+            commands = {}
+            for cmd_handler in self._commands:
+                patterns, description = self._pattern_info[cmd_handler]
+                commands[cmd_handler.__class__.__name__] = {
+                    'patterns': patterns,
+                    'description': description,
+                    'wake_word': self.wake_word
+                }
+            self._info_cache = commands
+        return self._info_cache
+    
     def list_commands(self) -> Dict[str, Dict[str, Any]]:
-        """List all registered commands with their patterns and descriptions."""
-        commands = {}
-        for cmd_handler in self._commands:
-            # Add wake word to each pattern
-            patterns_with_wake_word = [f"{self.wake_word} {pattern}" for pattern in cmd_handler.command_patterns]
-            commands[cmd_handler.__class__.__name__] = {
-                'patterns': patterns_with_wake_word,
-                'description': cmd_handler.description,
-                'wake_word': self.wake_word
-            }
-        return commands
\ No newline at end of file
+        """List all registered commands with their patterns and descriptions.
+        
+        Each call returns a new dict that the caller may modify.
+        """
+        return {
+            handler_name: {**info, 'patterns': list(info['patterns'])}
+            for handler_name, info in self._command_info().items()
+        }
+    
+    def list_commands_text(self) -> str:
+        """Get a preformatted, human-readable listing of all registered commands."""
+        if self._info_text_cache is None:
+            lines = []
+            for handler_name, info in self._command_info().items():
+                lines.append(f"\n{handler_name}:")
+                lines.append(f"  Description: {info['description']}")
+                lines.append("  Patterns:")
+                lines.extend(f"    - {pattern}" for pattern in info['patterns'])
+            self._info_text_cache = "\n".join(lines)
+        return self._info_text_cache
\ No newline at end of file
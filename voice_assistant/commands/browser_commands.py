@@ -2,54 +2,125 @@
 Browser and internet-related commands implementation.
 """
 
-import webbrowser
 import re
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import quote_plus
 
 from .base import Command
 from ..core.exceptions import CommandExecutionError
 
+_GOOGLE_RE = re.compile(r'cari di google (.+)')
+_WEB_RE = re.compile(r'buka website (.+)')
+
+# Built-in website shortcuts (copied per instance, which may add its own)
+_WEBSITE_SHORTCUTS = MappingProxyType({
+    'github': 'https://github.com',
+    'facebook': 'https://facebook.com',
+    'twitter': 'https://twitter.com',
+    'instagram': 'https://instagram.com',
+    'linkedin': 'https://linkedin.com',
+    'stackoverflow': 'https://stackoverflow.com',
+    'reddit': 'https://reddit.com',
+    'netflix': 'https://netflix.com',
+    'amazon': 'https://amazon.com',
+    'gmail': 'https://gmail.com',
+    'youtube': 'https://youtube.com',
+    'google': 'https://google.com'
+})
+
+
+class _ShortcutTrie:
+    """Character trie of website shortcuts; terminal nodes hold the URL under ''."""
+    
+    __slots__ = ("_root",)
+    
+    def __init__(self, shortcuts: Optional[Mapping[str, str]] = None):
+        self._root: Dict[str, Any] = {}
+        for name, url in (shortcuts or {}).items():
+            self.insert(name, url)
+    
+    def insert(self, name: str, url: str) -> None:
+        """Add or replace a shortcut."""
+        node = self._root
+        for char in name:
+            node = node.setdefault(char, {})
+        node[''] = url
+    
+    def remove(self, name: str) -> None:
+        """Remove a shortcut, pruning branches that no longer lead anywhere."""
+        path = []
+        node = self._root
+        for char in name:
+            child = node.get(char)
+            if child is None:
+                return
+            path.append((node, char))
+            node = child
+        node.pop('', None)
+        
+        for parent, char in reversed(path):
+            if parent[char]:
+                break
+            del parent[char]
+    
+    def __contains__(self, name: object) -> bool:
+        node = self._root
+        for char in str(name):
+            node = node.get(char)
+            if node is None:
+                return False
+        return '' in node
+    
+    def search(self, text: str) -> Optional[str]:
+        """Get the URL of the longest shortcut that starts ``text`` on a word boundary."""
+        node = self._root
+        url = None
+        last = len(text) - 1
+        for index, char in enumerate(text):
+            node = node.get(char)
+            if node is None:
+                break
+            if '' in node and (index == last or text[index + 1] == ' '):
+                url = node['']
+        return url
+
 
 class BrowserCommand(Command):
     """Handler for browser and internet commands."""
     
-    def __init__(self, logger: Optional = None):
+    __slots__ = ("website_shortcuts", "_trie", "_browser", "_opener")
+    
+    COMMAND_PATTERNS: tuple[str, ...] = (
+        "buka youtube",
+        "cari di google *",
+        "buka website *"
+    )
+    DESCRIPTION = "Handle browser commands: open YouTube, Google search, open websites"
+    
+    _PATTERNS: tuple[str, ...] = ("buka youtube", "cari di google", "buka website")
+    _PATTERN_RE = re.compile("|".join(map(re.escape, _PATTERNS)), re.IGNORECASE)
+    
+    def __init__(self, logger: Optional = None, opener: Optional[Callable[[str], Any]] = None):
         super().__init__(logger)
-        self.website_shortcuts = {
-            'github': 'https://github.com',
-            'facebook': 'https://facebook.com',
-            'twitter': 'https://twitter.com',
-            'instagram': 'https://instagram.com',
-            'linkedin': 'https://linkedin.com',
-            'stackoverflow': 'https://stackoverflow.com',
-            'reddit': 'https://reddit.com',
-            'netflix': 'https://netflix.com',
-            'amazon': 'https://amazon.com',
-            'gmail': 'https://gmail.com',
-            'youtube': 'https://youtube.com',
-            'google': 'https://google.com'
-        }
+        self.website_shortcuts = dict(_WEBSITE_SHORTCUTS)
+        # Kept in step with website_shortcuts by add/remove_website_shortcut
+        self._trie = _ShortcutTrie(self.website_shortcuts)
+        self._browser = None
+        # Called with each URL instead of the default browser when given
+        self._opener = opener
     
     @property
-    def command_patterns(self) -> list[str]:
-        return [
-            "buka youtube",
-            "cari di google *",
-            "buka website *"
-        ]
+    def command_patterns(self) -> tuple[str, ...]:
+        return self.COMMAND_PATTERNS
     
     @property
     def description(self) -> str:
-        return "Handle browser commands: open YouTube, Google search, open websites"
+        return self.DESCRIPTION
     
     def can_handle(self, command: str) -> bool:
         """Check if this command can handle the given input."""
-        patterns = [
-            "buka youtube",
-            "cari di google",
-            "buka website"
-        ]
-        return any(pattern in command.lower() for pattern in patterns)
+        return self._PATTERN_RE.search(command) is not None
     
     def execute(self, command: str, context: Optional[Dict[str, Any]] = None) -> Any:
         """Execute browser command."""
@@ -72,11 +143,21 @@ class BrowserCommand(Command):
             self.logger.error(f"Error executing browser command '{command}': {e}")
             raise CommandExecutionError(f"Failed to execute browser command: {e}")
     
+    def _open_url(self, url: str) -> None:
+        """Open URL with the injected opener, or in a new tab of a cached browser controller."""
+        if self._opener is not None:
+            self._opener(url)
+            return
+        if self._browser is None:
+            import webbrowser
+            self._browser = webbrowser.get()
+        self._browser.open_new_tab(url)
+    
     def _open_youtube(self) -> str:
         """Open YouTube in the default browser."""
         try:
             self.logger.info("Opening YouTube")
-            webbrowser.open("https://youtube.com")
+            self._open_url("https://youtube.com")
             return "YouTube opened"
         except Exception as e:
             raise CommandExecutionError(f"Failed to open YouTube: {e}")
@@ -85,7 +166,7 @@ class BrowserCommand(Command):
         """Perform Google search with extracted keywords."""
         try:
             # Extract search keywords using regex
-            search_match = re.search(r'cari di google (.+)', command)
+            search_match = _GOOGLE_RE.search(command)
             if not search_match:
                 raise CommandExecutionError("Could not extract search keywords")
             
@@ -94,10 +175,10 @@ class BrowserCommand(Command):
                 raise CommandExecutionError("No search keywords provided")
             
             # Create search URL
-            search_url = f"https://www.google.com/search?q={keywords.replace(' ', '+')}"
+            search_url = f"https://www.google.com/search?q={quote_plus(keywords)}"
             
             self.logger.info(f"Searching Google for: {keywords}")
-            webbrowser.open(search_url)
+            self._open_url(search_url)
             
             return f"Searching Google for: {keywords}"
             
@@ -108,7 +189,7 @@ class BrowserCommand(Command):
         """Open website by name."""
         try:
             # Extract website name using regex
-            website_match = re.search(r'buka website (.+)', command)
+            website_match = _WEB_RE.search(command)
             if not website_match:
                 raise CommandExecutionError("Could not extract website name")
             
@@ -116,14 +197,14 @@ class BrowserCommand(Command):
             if not website_name:
                 raise CommandExecutionError("No website name provided")
             
-            # Get URL from shortcuts
-            url = self.website_shortcuts.get(website_name)
+            # Get URL from shortcuts; "github sekarang" still finds github
+            url = self._trie.search(website_name)
             if not url:
                 # Try to construct URL if not in shortcuts
                 url = f"https://{website_name}.com"
             
             self.logger.info(f"Opening website: {url}")
-            webbrowser.open(url)
+            self._open_url(url)
             
             return f"Opened website: {url}"
             
@@ -136,12 +217,14 @@ class BrowserCommand(Command):
             url = f"https://{url}"
         
         self.website_shortcuts[name.lower()] = url
+        self._trie.insert(name.lower(), url)
         self.logger.info(f"Added website shortcut: {name} -> {url}")
     
     def remove_website_shortcut(self, name: str) -> None:
         """Remove a website shortcut."""
         if name.lower() in self.website_shortcuts:
             del self.website_shortcuts[name.lower()]
+            self._trie.remove(name.lower())
             self.logger.info(f"Removed website shortcut: {name}")
     
     def list_website_shortcuts(self) -> Dict[str, str]:
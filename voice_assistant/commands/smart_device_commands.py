@@ -2,90 +2,115 @@
 Smart device control commands implementation.
 """
 
-from typing import Any, Dict, Optional
+import re
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from importlib.util import find_spec
+from typing import Any, Dict, Iterator, Optional
 
 from .base import Command
 from ..core.exceptions import DeviceConnectionError
-from ..config.settings import ConfigManager
+from ..config.settings import ConfigManager, SmartDevice
 
-try:
-    import tinytuya
-except ImportError:
-    tinytuya = None
+# Imported on first use by _get_tinytuya(); only its presence is checked at startup
+tinytuya = None
+_TINYTUYA_INSTALLED = find_spec("tinytuya") is not None
+
+# Upper bound on concurrent device probes (each one blocks on network I/O)
+_MAX_PROBE_WORKERS = 8
+
+
+def _get_tinytuya():
+    """Import tinytuya on first use, returning None when it is not installed."""
+    global tinytuya
+    if tinytuya is None and _TINYTUYA_INSTALLED:
+        try:
+            import tinytuya as module
+        except ImportError:
+            return None
+        tinytuya = module
+    return tinytuya
 
 
 class SmartDeviceCommand(Command):
     """Handler for smart device control commands."""
     
+    __slots__ = ("config_manager", "_tuya_cache")
+    
+    COMMAND_PATTERNS: tuple[str, ...] = (
+        "nyalakan lampu",
+        "hidupkan lampu",
+        "matikan lampu",
+        "tutup lampu"
+    )
+    DESCRIPTION = "Control smart devices: turn lights on/off using TinyTuya"
+    
+    _PATTERNS_ON: tuple[str, ...] = ("nyalakan lampu", "hidupkan lampu")
+    _PATTERNS_OFF: tuple[str, ...] = ("matikan lampu", "tutup lampu")
+    _PATTERNS: tuple[str, ...] = _PATTERNS_ON + _PATTERNS_OFF
+    _PATTERN_RE = re.compile("|".join(map(re.escape, _PATTERNS)), re.IGNORECASE)
+    _ON_RE = re.compile("|".join(map(re.escape, _PATTERNS_ON)))
+    _OFF_RE = re.compile("|".join(map(re.escape, _PATTERNS_OFF)))
+    
     def __init__(self, config_manager: ConfigManager, logger: Optional = None):
         super().__init__(logger)
         self.config_manager = config_manager
+        self._tuya_cache: Dict[tuple[str, str, str], Any] = {}
         
-        if not tinytuya:
+        if tinytuya is None and not _TINYTUYA_INSTALLED:
             self.logger.warning("TinyTuya not installed. Smart device features disabled.")
     
     @property
-    def command_patterns(self) -> list[str]:
-        return [
-            "nyalakan lampu",
-            "hidupkan lampu", 
-            "matikan lampu",
-            "tutup lampu"
-        ]
+    def command_patterns(self) -> tuple[str, ...]:
+        return self.COMMAND_PATTERNS
     
     @property
     def description(self) -> str:
-        return "Control smart devices: turn lights on/off using TinyTuya"
+        return self.DESCRIPTION
     
     def can_handle(self, command: str) -> bool:
         """Check if this command can handle the given input."""
-        if not tinytuya:
+        if tinytuya is None and not _TINYTUYA_INSTALLED:
             return False
             
-        patterns = [
-            "nyalakan lampu",
-            "hidupkan lampu",
-            "matikan lampu", 
-            "tutup lampu"
-        ]
-        return any(pattern in command.lower() for pattern in patterns)
+        return self._PATTERN_RE.search(command) is not None
     
     def execute(self, command: str, context: Optional[Dict[str, Any]] = None) -> Any:
         """Execute smart device command."""
-        if not tinytuya:
+        if _get_tinytuya() is None:
             raise DeviceConnectionError("TinyTuya not available. Install with: pip install tinytuya")
         
-        command_lower = command.lower()
+        action = self._detect_action(command.lower())
         
         try:
-            if any(pattern in command_lower for pattern in ["nyalakan lampu", "hidupkan lampu"]):
-                return self._control_device("on")
-                
-            elif any(pattern in command_lower for pattern in ["matikan lampu", "tutup lampu"]):
-                return self._control_device("off")
-                
-            else:
+            if action is None:
                 raise DeviceConnectionError(f"Unknown smart device command: {command}")
+            
+            return self._control_device(action)
                 
         except Exception as e:
             self.logger.error(f"Error executing smart device command '{command}': {e}")
             raise DeviceConnectionError(f"Failed to execute smart device command: {e}")
     
+    def _detect_action(self, command_lower: str) -> Optional[str]:
+        """Map a lowercased command to the device action it requests."""
+        # "On" phrases take precedence wherever they appear, as before
+        if self._ON_RE.search(command_lower):
+            return "on"
+        if self._OFF_RE.search(command_lower):
+            return "off"
+        return None
+    
     def _control_device(self, action: str, device_name: Optional[str] = None) -> str:
         """Control smart device."""
+        device = None
         try:
             # Get device configuration
             device = self._get_device(device_name)
             if not device:
                 raise DeviceConnectionError("No smart devices configured or device not found")
             
-            # Create device connection
-            tuya_device = tinytuya.OutletDevice(
-                device.device_id,
-                device.ip_address,
-                device.local_key
-            )
-            tuya_device.set_version(3.3)
+            # Reuse the device connection object
+            tuya_device = self._get_tuya(device)
             
             # Execute action
             if action == "on":
@@ -102,8 +127,38 @@ class SmartDeviceCommand(Command):
                 raise DeviceConnectionError(f"Unknown action: {action}")
                 
         except Exception as e:
+            self._drop_tuya(device)
             raise DeviceConnectionError(f"Failed to control device: {e}")
     
+    @staticmethod
+    def _tuya_key(device: SmartDevice) -> tuple[str, str, str]:
+        """Cache key covering every field used to build the connection."""
+        return (device.device_id, device.ip_address, device.local_key)
+    
+    def _make_tuya(self, device: SmartDevice):
+        """Create a TinyTuya connection object for a configured device."""
+        tuya_device = tinytuya.OutletDevice(
+            device.device_id,
+            device.ip_address,
+            device.local_key
+        )
+        tuya_device.set_version(3.3)
+        return tuya_device
+    
+    def _get_tuya(self, device: SmartDevice):
+        """Get the cached TinyTuya connection object for a device, creating it once."""
+        key = self._tuya_key(device)
+        tuya_device = self._tuya_cache.get(key)
+        if tuya_device is None:
+            tuya_device = self._make_tuya(device)
+            self._tuya_cache[key] = tuya_device
+        return tuya_device
+    
+    def _drop_tuya(self, device: Optional[SmartDevice]) -> None:
+        """Forget a device connection object after it failed."""
+        if device is not None:
+            self._tuya_cache.pop(self._tuya_key(device), None)
+    
     def _get_device(self, device_name: Optional[str] = None):
         """Get device configuration."""
         devices = self.config_manager.config.smart_devices
@@ -113,30 +168,23 @@ class SmartDeviceCommand(Command):
         
         if device_name:
             # Look for specific device by name
-            for device in devices:
-                if device.name.lower() == device_name.lower():
-                    return device
-            return None
+            return self.config_manager.get_device_by_name(device_name)
         else:
             # Return first device if no specific name provided
             return devices[0]
     
     def get_device_status(self, device_name: Optional[str] = None) -> Dict[str, Any]:
         """Get status of smart device."""
-        if not tinytuya:
+        if _get_tinytuya() is None:
             raise DeviceConnectionError("TinyTuya not available")
         
+        device = None
         try:
             device = self._get_device(device_name)
             if not device:
                 raise DeviceConnectionError("Device not found")
             
-            tuya_device = tinytuya.OutletDevice(
-                device.device_id,
-                device.ip_address,
-                device.local_key
-            )
-            tuya_device.set_version(3.3)
+            tuya_device = self._get_tuya(device)
             
             status = tuya_device.status()
             self.logger.info(f"Retrieved status for device: {device.name}")
@@ -148,11 +196,12 @@ class SmartDeviceCommand(Command):
             }
             
         except Exception as e:
+            self._drop_tuya(device)
             raise DeviceConnectionError(f"Failed to get device status: {e}")
     
     def discover_devices(self) -> list[Dict[str, Any]]:
         """Discover available Tuya devices on the network."""
-        if not tinytuya:
+        if _get_tinytuya() is None:
             raise DeviceConnectionError("TinyTuya not available")
         
         try:
@@ -174,28 +223,61 @@ class SmartDeviceCommand(Command):
         except Exception as e:
             raise DeviceConnectionError(f"Failed to discover devices: {e}")
     
+    def discover_devices_async(self) -> "Future[list[Dict[str, Any]]]":
+        """Start device discovery in a background thread and return its future."""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tuya-scan")
+        try:
+            return executor.submit(self.discover_devices)
+        finally:
+            # Lets the scan finish without keeping the executor around
+            executor.shutdown(wait=False)
+    
+    def test_all_devices(self) -> Dict[str, bool]:
+        """Test connections to all configured devices in parallel."""
+        names = [device.name for device in self.config_manager.config.smart_devices]
+        if not names:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(len(names), _MAX_PROBE_WORKERS)) as executor:
+            return dict(zip(names, executor.map(self.test_device_connection, names)))
+    
+    def iter_device_statuses(self) -> Iterator[Dict[str, Any]]:
+        """Yield the status of each configured device as soon as it responds.
+        
+        Devices that fail to respond yield an entry with an ``error`` key
+        instead of a ``status``.
+        """
+        names = [device.name for device in self.config_manager.config.smart_devices]
+        if not names:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(len(names), _MAX_PROBE_WORKERS)) as executor:
+            futures = {executor.submit(self.get_device_status, name): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except DeviceConnectionError as e:
+                    yield {'device_name': futures[future], 'error': str(e)}
+    
     def test_device_connection(self, device_name: Optional[str] = None) -> bool:
         """Test connection to a smart device."""
-        if not tinytuya:
+        if _get_tinytuya() is None:
             return False
         
+        device = None
         try:
             device = self._get_device(device_name)
             if not device:
                 return False
             
-            tuya_device = tinytuya.OutletDevice(
-                device.device_id,
-                device.ip_address,
-                device.local_key
-            )
-            tuya_device.set_version(3.3)
+            tuya_device = self._get_tuya(device)
             
             # Try to get device status to test connection
             status = tuya_device.status()
             return status is not None
             
         except Exception as e:
+            self._drop_tuya(device)
             self.logger.error(f"Device connection test failed: {e}")
             return False
     
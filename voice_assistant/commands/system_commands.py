@@ -2,44 +2,170 @@
 System control commands implementation.
 """
 
+import logging
+import os
+import sched
 import subprocess
 import threading
-import psutil
+import time
 import re
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from .base import Command
 from ..core.exceptions import SystemCommandError
 
+if TYPE_CHECKING:
+    import psutil
+
+_MINUTES_RE = re.compile(r'(\d+)\s*menit', re.IGNORECASE)
+
+# "timer", "menit" and "matikan komputer" all present, in any order
+_TIMER_PHRASE_RE = re.compile(r'(?=.*timer)(?=.*menit).*matikan komputer', re.IGNORECASE)
+
+# System processes that are never closed
+_SYSTEM_PROCESSES = frozenset({
+    'system', 'registry', 'csrss.exe', 'winlogon.exe',
+    'services.exe', 'lsass.exe', 'svchost.exe', 'python.exe',
+    'dwm.exe', 'explorer.exe'  # Keep explorer running
+})
+
+# Upper bound on concurrent terminate calls
+_MAX_TERMINATE_WORKERS = 16
+
+# PIDs per taskkill invocation, well under the Windows command line limit
+_TASKKILL_BATCH_SIZE = 256
+
+
+def _safe_terminate(proc: 'psutil.Process') -> bool:
+    """Terminate a process, returning False if it is gone or protected."""
+    import psutil
+    
+    try:
+        proc.terminate()
+        return True
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return False
+
+
+def _taskkill(pids: list[int]) -> int:
+    """Force-terminate processes with batched taskkill calls (Windows only).
+    
+    Returns the number of processes actually terminated. Processes that
+    exited or are protected make taskkill report an error but do not stop
+    the batch.
+    """
+    import psutil
+    
+    killed = 0
+    for start in range(0, len(pids), _TASKKILL_BATCH_SIZE):
+        batch = pids[start:start + _TASKKILL_BATCH_SIZE]
+        args = ["taskkill", "/F"]
+        for pid in batch:
+            args += ["/PID", str(pid)]
+        result = subprocess.run(
+            args,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        )
+        if result.returncode == 0:
+            killed += len(batch)
+        else:
+            # taskkill's per-PID messages are localized, so check what is left instead
+            killed += sum(1 for pid in batch if not psutil.pid_exists(pid))
+    return killed
+
+
+class _SharedScheduler:
+    """Runs every pending timer on one lazily started thread.
+    
+    The thread sleeps on a condition variable, so newly scheduled or
+    cancelled events wake it up, and it exits once the queue is empty.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._scheduler = sched.scheduler(time.monotonic, self._wait)
+        self._thread: Optional[threading.Thread] = None
+        # Set when the queue changed, so a wake-up sent before the wait is not lost
+        self._changed = False
+    
+    def _wait(self, timeout: float) -> None:
+        with self._cond:
+            if not self._changed:
+                self._cond.wait(timeout)
+            self._changed = False
+    
+    def _run(self) -> None:
+        while True:
+            try:
+                self._scheduler.run()
+            except Exception:
+                # A failing action must not strand the remaining timers
+                logging.getLogger(self.__class__.__name__).exception("Scheduled task failed")
+            with self._cond:
+                if self._scheduler.empty():
+                    self._thread = None
+                    return
+    
+    def enter(self, delay: float, action) -> sched.Event:
+        """Schedule ``action`` to run after ``delay`` seconds."""
+        with self._cond:
+            event = self._scheduler.enter(delay, 1, action)
+            if self._thread is None:
+                # Not a daemon, matching threading.Timer: pending timers keep the process alive
+                self._thread = threading.Thread(target=self._run, name="timer-scheduler")
+                self._thread.start()
+            self._changed = True
+            self._cond.notify()
+        return event
+    
+    def cancel(self, event: sched.Event) -> None:
+        """Cancel a pending event; events that already ran are ignored."""
+        try:
+            self._scheduler.cancel(event)
+        except ValueError:
+            return
+        with self._cond:
+            self._changed = True
+            self._cond.notify()
+
+
+_SCHEDULER = _SharedScheduler()
+
 
 class SystemControlCommand(Command):
     """Handler for system control commands."""
     
+    __slots__ = ("shutdown_timer",)
+    
+    COMMAND_PATTERNS: tuple[str, ...] = (
+        "matikan komputer",
+        "tutup semua aplikasi",
+        "timer * menit matikan komputer"
+    )
+    DESCRIPTION = "Handle system control commands: shutdown, close apps, timer shutdown"
+    
+    _PATTERNS: tuple[str, ...] = ("matikan komputer", "tutup semua aplikasi", "timer", "menit")
+    _PATTERN_RE = re.compile("|".join(map(re.escape, _PATTERNS)), re.IGNORECASE)
+    
     def __init__(self, logger: Optional = None):
         super().__init__(logger)
-        self.shutdown_timer: Optional[threading.Timer] = None
+        self.shutdown_timer: Optional[sched.Event] = None
     
     @property
-    def command_patterns(self) -> list[str]:
-        return [
-            "matikan komputer",
-            "tutup semua aplikasi", 
-            "timer * menit matikan komputer"
-        ]
+    def command_patterns(self) -> tuple[str, ...]:
+        return self.COMMAND_PATTERNS
     
     @property
     def description(self) -> str:
-        return "Handle system control commands: shutdown, close apps, timer shutdown"
+        return self.DESCRIPTION
     
     def can_handle(self, command: str) -> bool:
         """Check if this command can handle the given input."""
-        patterns = [
-            "matikan komputer",
-            "tutup semua aplikasi",
-            "timer",
-            "menit"
-        ]
-        return any(pattern in command.lower() for pattern in patterns)
+        return self._PATTERN_RE.search(command) is not None
     
     def execute(self, command: str, context: Optional[Dict[str, Any]] = None) -> Any:
         """Execute system control command."""
@@ -52,7 +178,7 @@ class SystemControlCommand(Command):
             elif "tutup semua aplikasi" in command_lower:
                 return self._close_all_applications()
                 
-            elif "timer" in command_lower and "menit" in command_lower and "matikan komputer" in command_lower:
+            elif _TIMER_PHRASE_RE.match(command_lower):
                 return self._schedule_shutdown(command_lower)
                 
             else:
@@ -73,31 +199,26 @@ class SystemControlCommand(Command):
     
     def _close_all_applications(self) -> str:
         """Close all user applications."""
+        # Imported on first use to keep it off the startup path
+        import psutil
+        
         try:
             self.logger.info("Closing all applications")
-            closed_count = 0
             
-            # List of system processes to skip
-            system_processes = {
-                'system', 'registry', 'csrss.exe', 'winlogon.exe',
-                'services.exe', 'lsass.exe', 'svchost.exe', 'python.exe',
-                'dwm.exe', 'explorer.exe'  # Keep explorer running
-            }
+            # Collect targets in a single pass, skipping system processes
+            targets = [
+                proc for proc in psutil.process_iter(['pid', 'name'])
+                if (proc.info['name'] or '').lower() not in _SYSTEM_PROCESSES
+            ]
             
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    proc_name = proc.info['name'].lower()
-                    
-                    # Skip system processes and current process
-                    if proc_name in system_processes:
-                        continue
-                    
-                    # Terminate the process gracefully
-                    proc.terminate()
-                    closed_count += 1
-                    
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+            closed_count = 0
+            if targets and os.name == 'nt':
+                # One process spawn per batch instead of one OpenProcess per target
+                closed_count = _taskkill([proc.info['pid'] for proc in targets])
+            elif targets:
+                workers = min(len(targets), _MAX_TERMINATE_WORKERS)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    closed_count = sum(executor.map(_safe_terminate, targets))
             
             self.logger.info(f"Attempted to close {closed_count} applications")
             return f"Closed {closed_count} applications"
@@ -109,7 +230,7 @@ class SystemControlCommand(Command):
         """Schedule computer shutdown after specified minutes."""
         try:
             # Extract minutes from command
-            minutes_match = re.search(r'(\d+)\s*menit', command)
+            minutes_match = _MINUTES_RE.search(command)
             if not minutes_match:
                 raise SystemCommandError("Could not extract timer duration from command")
             
@@ -119,14 +240,13 @@ class SystemControlCommand(Command):
             
             # Cancel any existing timer
             if self.shutdown_timer:
-                self.shutdown_timer.cancel()
+                _SCHEDULER.cancel(self.shutdown_timer)
             
             seconds = minutes * 60
             self.logger.info(f"Scheduling shutdown in {minutes} minutes ({seconds} seconds)")
             
             # Schedule the shutdown
-            self.shutdown_timer = threading.Timer(seconds, self._delayed_shutdown)
-            self.shutdown_timer.start()
+            self.shutdown_timer = _SCHEDULER.enter(seconds, self._delayed_shutdown)
             
             return f"Computer will shutdown in {minutes} minutes"
             
@@ -146,6 +266,6 @@ class SystemControlCommand(Command):
     def cancel_shutdown_timer(self) -> None:
         """Cancel any pending shutdown timer."""
         if self.shutdown_timer:
-            self.shutdown_timer.cancel()
+            _SCHEDULER.cancel(self.shutdown_timer)
             self.shutdown_timer = None
             self.logger.info("Shutdown timer cancelled")
\ No newline at end of file
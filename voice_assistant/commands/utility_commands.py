@@ -2,8 +2,13 @@
 Utility commands implementation (screenshots, etc.).
 """
 
+import io
 import os
-import pyautogui
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -12,41 +17,116 @@ from .base import Command
 from ..core.exceptions import CommandExecutionError
 from ..config.settings import ConfigManager
 
+try:
+    import mss
+    import mss.tools
+except ImportError:
+    mss = None
+
+# Fast zlib setting; PNG stays lossless, files are only slightly larger
+_PNG_COMPRESS_LEVEL = 1
+
+# Cleanup deletes this many files or more on a thread pool
+_PARALLEL_UNLINK_THRESHOLD = 64
+_UNLINK_WORKERS = 8
+
+
+def _unlink_if_present(path: str) -> bool:
+    """Delete a file, returning False if it was already gone."""
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _is_screenshot_name(name: str) -> bool:
+    """Match ``screenshot_*.png`` without going through fnmatch."""
+    return name.startswith("screenshot_") and name.endswith(".png")
+
+
+def _write_file(filepath: Path, data: bytes) -> None:
+    """Write a file, recreating its folder if it was deleted while running."""
+    try:
+        filepath.write_bytes(data)
+    except FileNotFoundError:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_bytes(data)
+
+
+def _write_mss_png(raw: Any, filepath: Path) -> int:
+    """Encode an mss capture to PNG and write it (runs on the save pool).
+    
+    Returns the number of bytes written, so the file never has to be stat-ed.
+    """
+    png = mss.tools.to_png(raw.rgb, raw.size, level=_PNG_COMPRESS_LEVEL)
+    _write_file(filepath, png)
+    return len(png)
+
+
+def _write_image_png(image: Any, filepath: Path) -> int:
+    """Encode a PIL image to PNG and write it (runs on the save pool).
+    
+    Returns the number of bytes written, so the file never has to be stat-ed.
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=_PNG_COMPRESS_LEVEL)
+    png = buffer.getvalue()
+    _write_file(filepath, png)
+    return len(png)
+
 
 class UtilityCommand(Command):
     """Handler for utility commands like screenshots."""
     
+    __slots__ = (
+        "config_manager", "_sct_local", "_pending_saves",
+        "_screenshots_folder", "_screenshots_path", "_screenshots_dir_ready", "_screen_info"
+    )
+    
+    COMMAND_PATTERNS: tuple[str, ...] = (
+        "ambil screenshot",
+        "screenshot",
+        "tangkap layar"
+    )
+    DESCRIPTION = "Utility commands: take screenshots"
+    
+    _PATTERNS: tuple[str, ...] = ("ambil screenshot", "screenshot", "tangkap layar")
+    _PATTERN_RE = re.compile("|".join(map(re.escape, _PATTERNS)), re.IGNORECASE)
+    
+    # PNG encoding and writing run here, off the thread that grabbed the screen
+    _save_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot-save")
+    
     def __init__(self, config_manager: ConfigManager, logger: Optional = None):
         super().__init__(logger)
         self.config_manager = config_manager
+        # mss keeps per-thread device contexts on Windows, and commands run on
+        # several worker threads, so each thread opens its own instance
+        self._sct_local = threading.local()
+        self._pending_saves: deque[Future] = deque()
+        self._screenshots_folder: Optional[str] = None
+        self._screenshots_path: Optional[Path] = None
+        self._screenshots_dir_ready = False
+        self._screen_info: Optional[Dict[str, Any]] = None
     
     @property
-    def command_patterns(self) -> list[str]:
-        return [
-            "ambil screenshot",
-            "screenshot",
-            "tangkap layar"
-        ]
+    def command_patterns(self) -> tuple[str, ...]:
+        return self.COMMAND_PATTERNS
     
     @property
     def description(self) -> str:
-        return "Utility commands: take screenshots"
+        return self.DESCRIPTION
     
     def can_handle(self, command: str) -> bool:
         """Check if this command can handle the given input."""
-        patterns = [
-            "ambil screenshot",
-            "screenshot",
-            "tangkap layar"
-        ]
-        return any(pattern in command.lower() for pattern in patterns)
+        return self._PATTERN_RE.search(command) is not None
     
     def execute(self, command: str, context: Optional[Dict[str, Any]] = None) -> Any:
         """Execute utility command."""
         command_lower = command.lower()
         
         try:
-            if any(pattern in command_lower for pattern in ["ambil screenshot", "screenshot", "tangkap layar"]):
+            if self._PATTERN_RE.search(command_lower):
                 return self._take_screenshot()
             else:
                 raise CommandExecutionError(f"Unknown utility command: {command}")
@@ -55,91 +135,159 @@ class UtilityCommand(Command):
             self.logger.error(f"Error executing utility command '{command}': {e}")
             raise CommandExecutionError(f"Failed to execute utility command: {e}")
     
+    @property
+    def screenshots_path(self) -> Path:
+        """Get the screenshots folder, re-resolved only when the setting changes."""
+        folder = self.config_manager.config.settings.screenshots_folder
+        if folder != self._screenshots_folder:
+            self._screenshots_folder = folder
+            self._screenshots_path = Path(folder)
+            self._screenshots_dir_ready = False
+        return self._screenshots_path
+    
+    def _output_dir(self) -> Path:
+        """Get the screenshots folder, creating it the first time it is written to."""
+        screenshots_path = self.screenshots_path
+        if not self._screenshots_dir_ready:
+            screenshots_path.mkdir(parents=True, exist_ok=True)
+            self._screenshots_dir_ready = True
+        return screenshots_path
+    
     def _take_screenshot(self) -> str:
         """Take a screenshot and save it."""
         try:
-            # Get screenshots folder from config
-            screenshots_folder = self.config_manager.config.settings.screenshots_folder
-            
-            # Create screenshots directory if it doesn't exist
-            screenshots_path = Path(screenshots_folder)
-            screenshots_path.mkdir(parents=True, exist_ok=True)
+            # Get screenshots folder, created on first use
+            screenshots_path = self._output_dir()
             
             # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"screenshot_{timestamp}.png"
             filepath = screenshots_path / filename
             
             # Take screenshot
             self.logger.info(f"Taking screenshot: {filepath}")
-            screenshot = pyautogui.screenshot()
-            screenshot.save(str(filepath))
-            
-            # Verify file was created
-            if filepath.exists():
-                file_size = filepath.stat().st_size
-                self.logger.info(f"Screenshot saved: {filepath} ({file_size} bytes)")
-                return f"Screenshot saved: {filepath}"
-            else:
-                raise CommandExecutionError("Screenshot file was not created")
+            future = self._capture(filepath)
+            self._track_save(future, filepath, "Screenshot")
+            
+            # Only report success once the file is written; a failed save raises here
+            future.result()
+            return f"Screenshot saved: {filepath}"
                 
         except Exception as e:
             raise CommandExecutionError(f"Failed to take screenshot: {e}")
     
+    def _capture(self, filepath: Path, region: Optional[tuple[int, int, int, int]] = None) -> Future:
+        """Capture the screen (or a region of it) and save it as PNG in the background.
+        
+        Uses mss when installed, reusing one capture handle per thread,
+        and falls back to pyautogui otherwise. Returns the future of the save.
+        """
+        if mss is None:
+            # Imported on first use; pyautogui pulls in PIL and the display libraries
+            import pyautogui
+            
+            screenshot = pyautogui.screenshot(region=region) if region else pyautogui.screenshot()
+            return self._save_pool.submit(_write_image_png, screenshot, filepath)
+        
+        sct = getattr(self._sct_local, 'sct', None)
+        if sct is None:
+            sct = self._sct_local.sct = mss.mss()
+        
+        if region:
+            x, y, width, height = region
+            monitor = {'left': x, 'top': y, 'width': width, 'height': height}
+        else:
+            # Monitor 0 spans all displays, matching pyautogui's full capture
+            monitor = sct.monitors[0]
+        
+        raw = sct.grab(monitor)
+        return self._save_pool.submit(_write_mss_png, raw, filepath)
+    
+    def _track_save(self, future: Future, filepath: Path, label: str) -> None:
+        """Remember a pending save and log its outcome when it finishes."""
+        pending = self._pending_saves
+        while pending and pending[0].done():
+            pending.popleft()
+        pending.append(future)
+        future.add_done_callback(lambda f: self._log_save_result(f, filepath, label))
+    
+    def _log_save_result(self, future: Future, filepath: Path, label: str) -> None:
+        """Log whether a background save produced the file."""
+        error = future.exception()
+        if error is not None:
+            self.logger.error(f"Failed to save {label.lower()} {filepath}: {error}")
+        else:
+            self.logger.info(f"{label} saved: {filepath} ({future.result()} bytes)")
+    
+    def wait_for_pending_saves(self, timeout: Optional[float] = None) -> None:
+        """Block until screenshots still being encoded are written to disk."""
+        if self._pending_saves:
+            wait(list(self._pending_saves), timeout=timeout)
+            while self._pending_saves and self._pending_saves[0].done():
+                self._pending_saves.popleft()
+    
     def _take_partial_screenshot(self, x: int, y: int, width: int, height: int) -> str:
         """Take a partial screenshot of specified region."""
         try:
-            # Get screenshots folder from config
-            screenshots_folder = self.config_manager.config.settings.screenshots_folder
-            screenshots_path = Path(screenshots_folder)
-            screenshots_path.mkdir(parents=True, exist_ok=True)
+            # Get screenshots folder, created on first use
+            screenshots_path = self._output_dir()
             
             # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"screenshot_partial_{timestamp}.png"
             filepath = screenshots_path / filename
             
             # Take partial screenshot
             self.logger.info(f"Taking partial screenshot: {filepath} (region: {x},{y},{width},{height})")
-            screenshot = pyautogui.screenshot(region=(x, y, width, height))
-            screenshot.save(str(filepath))
+            future = self._capture(filepath, region=(x, y, width, height))
+            self._track_save(future, filepath, "Partial screenshot")
             
-            if filepath.exists():
-                file_size = filepath.stat().st_size
-                self.logger.info(f"Partial screenshot saved: {filepath} ({file_size} bytes)")
-                return f"Partial screenshot saved: {filepath}"
-            else:
-                raise CommandExecutionError("Partial screenshot file was not created")
+            future.result()
+            return f"Partial screenshot saved: {filepath}"
                 
         except Exception as e:
             raise CommandExecutionError(f"Failed to take partial screenshot: {e}")
     
-    def get_screen_info(self) -> Dict[str, Any]:
-        """Get screen information."""
-        try:
-            screen_size = pyautogui.size()
-            return {
+    def get_screen_info(self, refresh: bool = False) -> Dict[str, Any]:
+        """Get screen information.
+        
+        The size is queried once and cached; pass ``refresh=True`` after a
+        display configuration change.
+        """
+        if self._screen_info is None or refresh:
+            import pyautogui
+            
+            try:
+                screen_size = pyautogui.size()
+            except Exception as e:
+                raise CommandExecutionError(f"Failed to get screen info: {e}")
+            
+            self._screen_info = {
                 'width': screen_size.width,
                 'height': screen_size.height,
                 'total_pixels': screen_size.width * screen_size.height
             }
-        except Exception as e:
-            raise CommandExecutionError(f"Failed to get screen info: {e}")
+        return dict(self._screen_info)
     
     def list_screenshots(self, limit: Optional[int] = None) -> list[Dict[str, Any]]:
         """List existing screenshots."""
+        self.wait_for_pending_saves()
         try:
-            screenshots_folder = self.config_manager.config.settings.screenshots_folder
-            screenshots_path = Path(screenshots_folder)
+            screenshots_path = self.screenshots_path
             
             if not screenshots_path.exists():
                 return []
             
-            # Get all PNG files in screenshots folder
-            screenshot_files = list(screenshots_path.glob("screenshot_*.png"))
+            # Get all PNG files in screenshots folder, stat-ing each one once
+            with os.scandir(screenshots_path) as entries:
+                screenshot_files = [
+                    (entry, entry.stat())
+                    for entry in entries
+                    if _is_screenshot_name(entry.name)
+                ]
             
             # Sort by modification time (newest first)
-            screenshot_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            screenshot_files.sort(key=lambda item: item[1].st_mtime, reverse=True)
             
             # Apply limit if specified
             if limit:
@@ -147,11 +295,10 @@ class UtilityCommand(Command):
             
             # Build file info list
             screenshots = []
-            for file_path in screenshot_files:
-                stat = file_path.stat()
+            for entry, stat in screenshot_files:
                 screenshots.append({
-                    'filename': file_path.name,
-                    'filepath': str(file_path),
+                    'filename': entry.name,
+                    'filepath': entry.path,
                     'size_bytes': stat.st_size,
                     'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
                     'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
@@ -164,14 +311,14 @@ class UtilityCommand(Command):
     
     def delete_screenshot(self, filename: str) -> str:
         """Delete a specific screenshot."""
+        self.wait_for_pending_saves()
         try:
-            screenshots_folder = self.config_manager.config.settings.screenshots_folder
-            filepath = Path(screenshots_folder) / filename
+            filepath = self.screenshots_path / filename
             
-            if not filepath.exists():
+            try:
+                filepath.unlink()
+            except FileNotFoundError:
                 raise CommandExecutionError(f"Screenshot not found: {filename}")
-            
-            filepath.unlink()
             self.logger.info(f"Deleted screenshot: {filepath}")
             return f"Deleted screenshot: {filename}"
             
@@ -180,20 +327,28 @@ class UtilityCommand(Command):
     
     def cleanup_old_screenshots(self, days_old: int = 30) -> str:
         """Delete screenshots older than specified days."""
+        self.wait_for_pending_saves()
         try:
-            screenshots_folder = self.config_manager.config.settings.screenshots_folder
-            screenshots_path = Path(screenshots_folder)
+            screenshots_path = self.screenshots_path
             
             if not screenshots_path.exists():
                 return "No screenshots folder found"
             
-            cutoff_time = datetime.now().timestamp() - (days_old * 24 * 60 * 60)
-            deleted_count = 0
+            cutoff_time = time.time() - (days_old * 24 * 60 * 60)
             
-            for file_path in screenshots_path.glob("screenshot_*.png"):
-                if file_path.stat().st_mtime < cutoff_time:
-                    file_path.unlink()
-                    deleted_count += 1
+            # DirEntry.stat() is served from the directory listing where possible
+            with os.scandir(screenshots_path) as entries:
+                expired = [
+                    entry.path for entry in entries
+                    if _is_screenshot_name(entry.name) and entry.stat().st_mtime < cutoff_time
+                ]
+            
+            if len(expired) >= _PARALLEL_UNLINK_THRESHOLD:
+                # Unlinks block on the filesystem, so large batches overlap them
+                with ThreadPoolExecutor(max_workers=_UNLINK_WORKERS) as executor:
+                    deleted_count = sum(executor.map(_unlink_if_present, expired))
+            else:
+                deleted_count = sum(map(_unlink_if_present, expired))
             
             self.logger.info(f"Deleted {deleted_count} screenshots older than {days_old} days")
             return f"Deleted {deleted_count} old screenshots"
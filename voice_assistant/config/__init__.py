@@ -0,0 +1,3 @@
+"""
+Configuration management for the Voice Assistant.
+"""
\ No newline at end of file
@@ -4,14 +4,59 @@ Configuration management with validation for the Voice Assistant.
 
 import json
 import os
-from dataclasses import dataclass, field
+import sys
+from dataclasses import asdict, dataclass, field
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
 from ..core.exceptions import ConfigurationError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Slotted dataclasses need Python 3.10+; older interpreters keep __dict__
+_DATACLASS_OPTIONS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+
+# Parsed JSON of config files keyed by absolute path, tagged with the file's
+# (mtime_ns, size) so an edited file is parsed again
+_RAW_CONFIG_CACHE: Dict[str, tuple[tuple[int, int], Dict[str, Any]]] = {}
+
+
+def _read_config_data(config_path: str) -> Dict[str, Any]:
+    """Read and parse a JSON config file."""
+    config_file = Path(config_path)
+    
+    if not config_file.exists():
+        raise ConfigurationError(f"Configuration file not found: {config_path}")
+    
+    try:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return _json_loads(config_file.read_bytes())
+    except json.JSONDecodeError as e:
+        raise ConfigurationError(f"Invalid JSON in config file: {e}")
+    except Exception as e:
+        raise ConfigurationError(f"Error reading config file: {e}")
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class SmartDevice:
     """Configuration for a smart device."""
     name: str
@@ -26,7 +71,7 @@ class SmartDevice:
             raise ConfigurationError("All device fields are required")
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AssistantSettings:
     """General settings for the voice assistant."""
     speech_timeout: int = 5
@@ -41,11 +86,11 @@ class AssistantSettings:
         if self.speech_timeout <= 0 or self.phrase_time_limit <= 0:
             raise ConfigurationError("Timeout values must be positive")
         
-        if self.log_level not in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
+        if self.log_level not in _VALID_LOG_LEVELS:
             raise ConfigurationError("Invalid log level")
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Configuration:
     """Main configuration class."""
     smart_devices: List[SmartDevice] = field(default_factory=list)
@@ -55,18 +100,15 @@ class Configuration:
     @classmethod
     def from_file(cls, config_path: str) -> 'Configuration':
         """Load configuration from JSON file."""
-        config_file = Path(config_path)
-        
-        if not config_file.exists():
-            raise ConfigurationError(f"Configuration file not found: {config_path}")
-        
+        return cls.from_dict(_read_config_data(config_path))
+    
+    @classmethod
+    def from_json_str(cls, text: str) -> 'Configuration':
+        """Create configuration from a JSON string, as written by ``to_json_str``."""
         try:
-            with config_file.open('r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _json_loads(text.encode('utf-8'))
         except json.JSONDecodeError as e:
-            raise ConfigurationError(f"Invalid JSON in config file: {e}")
-        except Exception as e:
-            raise ConfigurationError(f"Error reading config file: {e}")
+            raise ConfigurationError(f"Invalid JSON configuration: {e}")
         
         return cls.from_dict(data)
     
@@ -82,8 +124,8 @@ class Configuration:
             settings_data = data.get('settings', {})
             settings = AssistantSettings(**settings_data)
             
-            # Parse application shortcuts
-            app_shortcuts = data.get('application_shortcuts', {})
+            # Parse application shortcuts; copied so ``data`` may be reused
+            app_shortcuts = dict(data.get('application_shortcuts', {}))
             
             return cls(
                 smart_devices=smart_devices,
@@ -95,26 +137,11 @@ class Configuration:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary."""
-        return {
-            'smart_devices': [
-                {
-                    'name': device.name,
-                    'device_id': device.device_id,
-                    'ip_address': device.ip_address,
-                    'local_key': device.local_key,
-                    'device_type': device.device_type
-                }
-                for device in self.smart_devices
-            ],
-            'settings': {
-                'speech_timeout': self.settings.speech_timeout,
-                'phrase_time_limit': self.settings.phrase_time_limit,
-                'language': self.settings.language,
-                'log_level': self.settings.log_level,
-                'screenshots_folder': self.settings.screenshots_folder
-            },
-            'application_shortcuts': self.application_shortcuts
-        }
+        return asdict(self)
+    
+    def to_json_str(self) -> str:
+        """Serialize configuration to the same JSON text ``save_to_file`` writes."""
+        return _json_dumps(self.to_dict()).decode('utf-8')
     
     def save_to_file(self, config_path: str) -> None:
         """Save configuration to JSON file."""
@@ -122,8 +149,7 @@ class Configuration:
             config_file = Path(config_path)
             config_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with config_file.open('w', encoding='utf-8') as f:
-                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            config_file.write_bytes(_json_dumps(self.to_dict()))
         except Exception as e:
             raise ConfigurationError(f"Error saving config file: {e}")
     
@@ -141,6 +167,8 @@ class ConfigManager:
     def __init__(self, config_path: str = "config/devices.json"):
         self.config_path = config_path
         self._config: Optional[Configuration] = None
+        self._device_by_name: Optional[Dict[str, SmartDevice]] = None
+        self._app_shortcuts_lower: Optional[Dict[str, str]] = None
     
     @property
     def config(self) -> Configuration:
@@ -149,24 +177,56 @@ class ConfigManager:
             self.load_config()
         return self._config
     
-    def load_config(self) -> None:
-        """Load configuration from file."""
+    def _invalidate_lookups(self) -> None:
+        """Drop the name lookup tables so they are rebuilt from the current config."""
+        self._device_by_name = None
+        self._app_shortcuts_lower = None
+    
+    def load_config(self, reload: bool = False) -> None:
+        """Load configuration from file, discarding unsaved in-memory edits.
+        
+        The parsed JSON of a file that has not changed since it was last
+        read (same mtime and size) is reused from a process-wide cache; a
+        new ``Configuration`` is still built from it on every call. Pass
+        ``reload`` to always read the file from disk.
+        """
+        self._invalidate_lookups()
         try:
-            if os.path.exists(self.config_path):
-                self._config = Configuration.from_file(self.config_path)
-            else:
+            try:
+                stat = os.stat(self.config_path)
+            except FileNotFoundError:
                 self._config = Configuration()
                 self.create_default_config()
+                self._config.validate()
+                return
+            
+            cache_key = os.path.abspath(self.config_path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            cached = _RAW_CONFIG_CACHE.get(cache_key)
+            if not reload and cached is not None and cached[0] == stamp:
+                data = cached[1]
+            else:
+                data = _read_config_data(self.config_path)
+                _RAW_CONFIG_CACHE[cache_key] = (stamp, data)
             
-            self._config.validate()
+            # from_dict builds fresh objects, so managers never share one
+            config = Configuration.from_dict(data)
+            config.validate()
+            self._config = config
         except Exception as e:
             raise ConfigurationError(f"Failed to load configuration: {e}")
     
+    def invalidate(self) -> None:
+        """Forget the cached parse of this config file so the next load re-reads it."""
+        _RAW_CONFIG_CACHE.pop(os.path.abspath(self.config_path), None)
+        self._invalidate_lookups()
+    
     def save_config(self) -> None:
         """Save current configuration to file."""
         if self._config is None:
             raise ConfigurationError("No configuration to save")
         
+        self.invalidate()
         self._config.save_to_file(self.config_path)
     
     def create_default_config(self) -> None:
@@ -205,12 +265,20 @@ class ConfigManager:
         self.save_config()
     
     def get_device_by_name(self, name: str) -> Optional[SmartDevice]:
-        """Get a smart device by name."""
-        for device in self.config.smart_devices:
-            if device.name.lower() == name.lower():
-                return device
-        return None
+        """Get a smart device by name (case-insensitive)."""
+        if self._device_by_name is None:
+            devices = {}
+            for device in self.config.smart_devices:
+                # First device wins on duplicate names, as with a linear scan
+                devices.setdefault(device.name.lower(), device)
+            self._device_by_name = devices
+        return self._device_by_name.get(name.lower())
     
     def get_application_command(self, app_name: str) -> Optional[str]:
-        """Get application command by name."""
-        return self.config.application_shortcuts.get(app_name.lower())
\ No newline at end of file
+        """Get application command by name (case-insensitive)."""
+        if self._app_shortcuts_lower is None:
+            self._app_shortcuts_lower = {
+                name.lower(): command
+                for name, command in self.config.application_shortcuts.items()
+            }
+        return self._app_shortcuts_lower.get(app_name.lower())
\ No newline at end of file
@@ -2,8 +2,24 @@
 Core components for the Voice Assistant.
 """
 
-from .assistant import VoiceAssistant
+import importlib
+
 from .exceptions import VoiceAssistantError
-from .factory import AssistantFactory
 
-__all__ = ["VoiceAssistant", "VoiceAssistantError", "AssistantFactory"]
\ No newline at end of file
+_LAZY = {
+    "VoiceAssistant": ".assistant",
+    "AssistantFactory": ".factory",
+}
+
+__all__ = ["VoiceAssistant", "VoiceAssistantError", "AssistantFactory"]
+
+
+def __getattr__(name: str):
+    """Import assistant and factory on first access."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module = importlib.import_module(_LAZY[name], __name__)
+    obj = getattr(module, name)
+    globals()[name] = obj
+    return obj
\ No newline at end of file
@@ -2,9 +2,10 @@
 Main Voice Assistant implementation with dependency injection.
 """
 
+import queue
 import threading
-import time
-from typing import Optional, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, Dict, Any
 import logging
 
 from ..config.settings import ConfigManager
@@ -13,6 +14,53 @@ from ..services.logging_service import LoggingService
 from ..commands.base import CommandRegistry
 from .exceptions import VoiceAssistantError, CommandExecutionError
 
+# Commands run concurrently on at most this many worker threads
+_COMMAND_WORKERS = 4
+
+
+class _LoopWorker:
+    """One long-lived daemon thread that runs submitted callables in order.
+    
+    Restarting the assistant reuses the thread instead of creating a new one.
+    Being a daemon, a loop still running at interpreter exit does not block it.
+    """
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._tasks: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        """Queue ``fn`` and return a future for its result."""
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            self._tasks.put((fn, future))
+        return future
+    
+    def _run(self) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            fn, future = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def shutdown(self) -> None:
+        """Let the thread exit after the tasks already queued."""
+        with self._lock:
+            if self._thread is not None:
+                self._tasks.put(None)
+                self._thread = None
+
 
 class VoiceAssistant:
     """Main Voice Assistant class with dependency injection."""
@@ -31,18 +79,38 @@ class VoiceAssistant:
         self.logging_service = logging_service
         
         self.logger = logging_service.get_logger('voice_assistant.main')
-        self.running = False
-        self._main_thread: Optional[threading.Thread] = None
+        # Set while stopped; the main loop exits as soon as it is set
+        self._stop_event = threading.Event()
+        self._stop_event.set()
+        self._loop_worker = _LoopWorker("assistant-loop")
+        self._loop_future: Optional[Future] = None
+        self._executor: Optional[ThreadPoolExecutor] = self._create_executor()
         
         self.logger.info("Voice Assistant initialized with dependency injection")
     
+    @property
+    def running(self) -> bool:
+        """Whether the assistant is currently running."""
+        return not self._stop_event.is_set()
+    
+    @staticmethod
+    def _create_executor() -> ThreadPoolExecutor:
+        """Create the worker pool that runs recognized commands."""
+        return ThreadPoolExecutor(max_workers=_COMMAND_WORKERS, thread_name_prefix="cmd")
+    
+    def _ensure_executor(self) -> None:
+        """Recreate the worker pool if a previous stop() shut it down."""
+        if self._executor is None:
+            self._executor = self._create_executor()
+    
     def start(self) -> None:
         """Start the voice assistant in the main thread.""" 
         if self.running:
             self.logger.warning("Voice Assistant is already running")
             return
         
-        self.running = True
+        self._ensure_executor()
+        self._stop_event.clear()
         self.logger.info("Starting Voice Assistant...")
         
         try:
@@ -61,11 +129,11 @@ class VoiceAssistant:
             self.logger.warning("Voice Assistant is already running")
             return
         
-        self.running = True
+        self._ensure_executor()
+        self._stop_event.clear()
         self.logger.info("Starting Voice Assistant in background thread...")
         
-        self._main_thread = threading.Thread(target=self._run_main_loop, daemon=True)
-        self._main_thread.start()
+        self._loop_future = self._loop_worker.submit(self._run_main_loop)
     
     def stop(self) -> None:
         """Stop the voice assistant."""
@@ -73,51 +141,71 @@ class VoiceAssistant:
             return
         
         self.logger.info("Stopping Voice Assistant...")
-        self.running = False
+        self._stop_event.set()
         
-        # Wait for main thread to finish if running async
-        if self._main_thread and self._main_thread.is_alive():
-            self._main_thread.join(timeout=5.0)
-            if self._main_thread.is_alive():
+        # Wait for the background loop to finish if running async
+        if self._loop_future is not None:
+            try:
+                self._loop_future.result(timeout=5.0)
+            except FutureTimeoutError:
                 self.logger.warning("Main thread did not stop gracefully")
+            except Exception as e:
+                self.logger.error(f"Main loop ended with an error: {e}")
+            self._loop_future = None
         
+        # Drop queued commands and wait for the ones already running
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        
+        # The logging listener is shared by the process and stopped at exit
         self.logger.info("Voice Assistant stopped")
     
     def _run_main_loop(self) -> None:
         """Main loop - continuously listen for voice commands."""
         self.logger.info("Voice Assistant main loop started. Listening for commands...")
         
-        while self.running:
-            try:
-                # Listen for command
-                command = self.speech_service.listen_for_command()
-                
-                if command and self.running:
-                    # Process command in separate thread to avoid blocking
-                    command_thread = threading.Thread(
-                        target=self._process_command_safely,
-                        args=(command,),
-                        daemon=True
-                    )
-                    command_thread.start()
-                
-                # Small delay to prevent excessive CPU usage
-                time.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"Error in main loop: {e}")
-                time.sleep(1)  # Brief pause before continuing
+        # Keep the microphone stream open for the whole loop instead of per listen
+        try:
+            self.speech_service.open_stream()
+        except Exception as e:
+            self.logger.warning(f"Could not keep microphone stream open, reopening per listen: {e}")
+        
+        # Record the next phrase while the previous one is being recognized
+        try:
+            self.speech_service.start_capture()
+        except Exception as e:
+            self.logger.warning(f"Background capture unavailable, listening inline: {e}")
+        
+        stop_event = self._stop_event
+        try:
+            while not stop_event.is_set():
+                try:
+                    # Listen for command
+                    command = self.speech_service.listen_for_command()
+                    
+                    if command and not stop_event.is_set():
+                        # Process command on the worker pool to avoid blocking
+                        self._executor.submit(self._process_command_safely, command)
+                    
+                except Exception as e:
+                    self.logger.error(f"Error in main loop: {e}")
+                    # Brief pause before continuing, cut short by stop()
+                    stop_event.wait(1.0)
+        finally:
+            self.speech_service.stop_capture()
+            self.speech_service.close_stream()
     
     def _process_command_safely(self, command: str) -> None:
         """Process command with error handling."""
         try:
-            self.logger.info(f"Processing command: {command}")
+            self.logger.info("Processing command: %s", command)
             
             # Execute command through registry
             result = self.command_registry.execute_command(command)
             
             if result:
-                self.logger.info(f"Command executed successfully: {result}")
+                self.logger.info("Command executed successfully: %s", result)
             else:
                 self.logger.info("Command executed successfully")
                 
@@ -129,7 +217,7 @@ class VoiceAssistant:
     def process_command(self, command: str, context: Optional[Dict[str, Any]] = None) -> Any:
         """Process a single command (for API/testing usage)."""
         try:
-            self.logger.info(f"Processing single command: {command}")
+            self.logger.info("Processing single command: %s", command)
             return self.command_registry.execute_command(command, context)
         except Exception as e:
             self.logger.error(f"Error processing command '{command}': {e}")
@@ -137,16 +225,17 @@ class VoiceAssistant:
     
     def is_running(self) -> bool:
         """Check if the assistant is currently running."""
-        return self.running
+        return not self._stop_event.is_set()
     
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the voice assistant."""
+        commands = self.command_registry.list_commands()
         return {
             'running': self.running,
             'config_loaded': self.config_manager.config is not None,
             'microphone_available': self.speech_service.test_microphone(),
-            'registered_commands': len(self.command_registry._commands),
-            'command_handlers': list(self.command_registry.list_commands().keys())
+            'registered_commands': len(commands),
+            'command_handlers': list(commands)
         }
     
     def get_commands_info(self) -> Dict[str, Dict[str, Any]]:
@@ -183,16 +272,17 @@ class VoiceAssistant:
         """Reload configuration from file."""
         try:
             self.logger.info("Reloading configuration...")
-            self.config_manager.load_config()
+            self.config_manager.load_config(reload=True)
+            self.speech_service.refresh_settings_cache()
             self.logger.info("Configuration reloaded successfully")
         except Exception as e:
             self.logger.error(f"Failed to reload configuration: {e}")
             raise VoiceAssistantError(f"Configuration reload failed: {e}")
     
-    def set_log_level(self, level: str) -> None:
-        """Set logging level."""
+    def set_log_level(self, level: str, persist: bool = False) -> None:
+        """Set logging level, saving it to the config file if ``persist`` is set."""
         try:
-            self.logging_service.set_log_level(level)
+            self.logging_service.set_log_level(level, persist=persist)
             self.logger.info(f"Log level set to: {level}")
         except Exception as e:
             self.logger.error(f"Failed to set log level: {e}")
@@ -204,4 +294,5 @@ class VoiceAssistant:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.stop()
\ No newline at end of file
+        self.stop()
+        self._loop_worker.shutdown()
\ No newline at end of file
@@ -84,12 +84,17 @@ class AssistantFactory:
             device_command = SmartDeviceCommand(self.config_manager, logger)
             utility_command = UtilityCommand(self.config_manager, logger)
             
-            # Register all commands
-            registry.register(system_command)
-            registry.register(browser_command)
-            registry.register(app_command)
-            registry.register(device_command)
-            registry.register(utility_command)
+            # Register all commands; the trigger dispatch tables are built once
+            registry.register_all([
+                system_command,
+                browser_command,
+                app_command,
+                device_command,
+                utility_command
+            ])
+            
+            # No handlers are added after bootstrap
+            registry.freeze()
             
             logger.info("Command registry created with all handlers registered")
             return registry
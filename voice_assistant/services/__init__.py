@@ -3,6 +3,6 @@ Service layer for the Voice Assistant.
 """
 
 from .speech_service import SpeechRecognitionService
-from .logging_service import LoggingService
+from .logging_service import LoggingService, LogFileInfo
 
-__all__ = ["SpeechRecognitionService", "LoggingService"]
\ No newline at end of file
+__all__ = ["SpeechRecognitionService", "LoggingService", "LogFileInfo"]
\ No newline at end of file
@@ -2,21 +2,51 @@
 Logging service implementation.
 """
 
+import atexit
 import logging
 import logging.handlers
+import os
+import queue
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import ClassVar, Dict, Optional, TypedDict
 
 from ..config.settings import ConfigManager
 
+# Initial read size when tailing the log; doubled until enough lines are found
+_TAIL_BLOCK_SIZE = 8192
+
+class LogFileInfo(TypedDict):
+    """Size and modification time of one log file."""
+    name: str
+    path: str
+    size_bytes: int
+    size_mb: float
+    modified: float
+
 
 class LoggingService:
     """Service for managing application logging."""
     
+    _LEVELS: ClassVar[Dict[str, int]] = {
+        'DEBUG': logging.DEBUG,
+        'INFO': logging.INFO,
+        'WARNING': logging.WARNING,
+        'ERROR': logging.ERROR,
+        'CRITICAL': logging.CRITICAL
+    }
+    
+    # The service whose queue listener currently feeds the root logger
+    _active: ClassVar[Optional["LoggingService"]] = None
+    
     def __init__(self, config_manager: ConfigManager, log_dir: str = "logs"):
         self.config_manager = config_manager
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self._log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._queue_handler: Optional[logging.handlers.QueueHandler] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._handlers: list[logging.Handler] = []
         
         self._setup_logging()
     
@@ -24,17 +54,21 @@ class LoggingService:
         """Setup logging configuration."""
         try:
             # Get log level from config
-            log_level = getattr(
-                logging,
-                self.config_manager.config.settings.log_level.upper(),
-                logging.INFO
-            )
+            log_level = self._level_number(self.config_manager.config.settings.log_level)
             
             # Create root logger
             root_logger = logging.getLogger()
             root_logger.setLevel(log_level)
             
-            # Clear any existing handlers
+            # Stop whichever listener feeds the root logger, then clear its handlers
+            previous = LoggingService._active
+            if previous is not None and previous is not self:
+                previous.shutdown()
+                # Its files would otherwise stay open once detached below
+                for handler in previous._handlers:
+                    handler.close()
+                previous._handlers = []
+            self.shutdown()
             root_logger.handlers.clear()
             
             # Create formatters
@@ -63,9 +97,16 @@ class LoggingService:
             console_handler.setLevel(log_level)
             console_handler.setFormatter(simple_formatter)
             
-            # Add handlers to root logger
-            root_logger.addHandler(file_handler)
-            root_logger.addHandler(console_handler)
+            # Loggers only format and enqueue records (QueueHandler.prepare runs on
+            # the calling thread); the file and console I/O run on the listener thread
+            self._handlers = [file_handler, console_handler]
+            self._queue_handler = logging.handlers.QueueHandler(self._log_queue)
+            root_logger.addHandler(self._queue_handler)
+            self._listener = logging.handlers.QueueListener(
+                self._log_queue, *self._handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            LoggingService._active = self
             
             # Create application-specific logger
             app_logger = logging.getLogger('voice_assistant')
@@ -75,44 +116,85 @@ class LoggingService:
             print(f"Failed to setup logging: {e}")
             raise
     
+    def shutdown(self) -> None:
+        """Flush queued records and write any later ones directly from the caller."""
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        listener.stop()
+        if LoggingService._active is self:
+            LoggingService._active = None
+        
+        root_logger = logging.getLogger()
+        root_logger.removeHandler(self._queue_handler)
+        self._queue_handler = None
+        for handler in self._handlers:
+            root_logger.addHandler(handler)
+    
+    @classmethod
+    def _level_number(cls, name: str) -> int:
+        """Map a level name to its number; unknown names raise ValueError."""
+        log_level = cls._LEVELS.get(name.upper())
+        if log_level is None:
+            raise ValueError(f"Unknown log level '{name}', expected one of {', '.join(cls._LEVELS)}")
+        return log_level
+    
+    @classmethod
+    def _shutdown_active(cls) -> None:
+        """Stop the active listener at interpreter exit."""
+        if cls._active is not None:
+            cls._active.shutdown()
+    
     def get_logger(self, name: str) -> logging.Logger:
         """Get a logger instance with the specified name."""
         return logging.getLogger(name)
     
-    def set_log_level(self, level: str) -> None:
-        """Set logging level dynamically."""
+    def set_log_level(self, level: str, persist: bool = False) -> None:
+        """Set logging level dynamically.
+        
+        Only the running handlers and the in-memory config change unless
+        ``persist`` is set; see ``persist_log_level``. Unknown level names
+        raise ValueError, as they do everywhere else in this service.
+        """
+        level = level.upper()
+        log_level = self._level_number(level)
+        
         try:
-            log_level = getattr(logging, level.upper(), logging.INFO)
-            
             # Update all handlers
             root_logger = logging.getLogger()
             root_logger.setLevel(log_level)
             
             for handler in root_logger.handlers:
                 handler.setLevel(log_level)
+            # Handlers behind the queue listener are not on the root logger
+            for handler in self._handlers:
+                handler.setLevel(log_level)
             
             # Update config
-            self.config_manager.config.settings.log_level = level.upper()
-            self.config_manager.save_config()
+            self.config_manager.config.settings.log_level = level
+            if persist:
+                self.persist_log_level()
             
             logger = logging.getLogger('voice_assistant')
-            logger.info(f"Log level changed to: {level.upper()}")
+            logger.info(f"Log level changed to: {level}")
             
         except Exception as e:
             logger = logging.getLogger('voice_assistant')
             logger.error(f"Failed to set log level: {e}")
     
+    def persist_log_level(self) -> None:
+        """Write the current configuration, including the log level, to disk."""
+        self.config_manager.save_config()
+    
     def add_file_handler(self, filename: str, level: Optional[str] = None) -> logging.FileHandler:
         """Add an additional file handler."""
         try:
+            # Resolved first so an unknown name does not leave a file open
+            log_level = self._level_number(level) if level else logging.INFO
+            
             file_path = self.log_dir / filename
             handler = logging.FileHandler(file_path, encoding='utf-8')
-            
-            # Set level
-            if level:
-                handler.setLevel(getattr(logging, level.upper(), logging.INFO))
-            else:
-                handler.setLevel(logging.INFO)
+            handler.setLevel(log_level)
             
             # Set formatter
             formatter = logging.Formatter(
@@ -135,23 +217,27 @@ class LoggingService:
             logger.error(f"Failed to add file handler: {e}")
             raise
     
-    def get_log_files(self) -> list[dict]:
-        """Get list of log files with their information."""
+    def get_log_files(self) -> list[LogFileInfo]:
+        """Get list of log files with their information, newest first."""
         try:
             log_files = []
             
-            for log_file in self.log_dir.glob("*.log*"):
-                stat = log_file.stat()
-                log_files.append({
-                    'name': log_file.name,
-                    'path': str(log_file),
-                    'size_bytes': stat.st_size,
-                    'size_mb': round(stat.st_size / (1024*1024), 2),
-                    'modified': stat.st_mtime
-                })
+            # scandir entries carry their name, so only the matches need a stat call
+            with os.scandir(self.log_dir) as it:
+                for entry in it:
+                    if '.log' not in entry.name:
+                        continue
+                    stat = entry.stat()
+                    log_files.append(LogFileInfo(
+                        name=entry.name,
+                        path=entry.path,
+                        size_bytes=stat.st_size,
+                        size_mb=round(stat.st_size / (1024*1024), 2),
+                        modified=stat.st_mtime
+                    ))
             
             # Sort by modification time (newest first)
-            log_files.sort(key=lambda x: x['modified'], reverse=True)
+            log_files.sort(key=itemgetter('modified'), reverse=True)
             
             return log_files
             
@@ -167,10 +253,11 @@ class LoggingService:
             cutoff_time = time.time() - (days_old * 24 * 60 * 60)
             deleted_count = 0
             
-            for log_file in self.log_dir.glob("*.log*"):
-                if log_file.stat().st_mtime < cutoff_time:
-                    log_file.unlink()
-                    deleted_count += 1
+            with os.scandir(self.log_dir) as it:
+                for entry in it:
+                    if '.log' in entry.name and entry.stat().st_mtime < cutoff_time:
+                        os.unlink(entry.path)
+                        deleted_count += 1
             
             logger = logging.getLogger('voice_assistant')
             logger.info(f"Cleaned up {deleted_count} log files older than {days_old} days")
@@ -190,11 +277,33 @@ class LoggingService:
             if not log_file.exists():
                 return []
             
-            with open(log_file, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-                return [line.rstrip() for line in all_lines[-lines:]]
+            if lines <= 0:
+                # Same as slicing with [-0:]: the whole file
+                with open(log_file, 'r', encoding='utf-8') as f:
+                    return [line.rstrip() for line in f]
+            
+            # Read backwards from the end in growing blocks instead of the whole file
+            with open(log_file, 'rb') as f:
+                end = f.seek(0, os.SEEK_END)
+                block = _TAIL_BLOCK_SIZE
+                while True:
+                    start = max(0, end - block)
+                    f.seek(start)
+                    data = f.read(end - start)
+                    if start == 0 or data.count(b'\n') > lines:
+                        break
+                    block *= 2
+            
+            tail = data.split(b'\n')
+            if tail and not tail[-1]:
+                tail.pop()
+            return [line.decode('utf-8', errors='replace').rstrip() for line in tail[-lines:]]
                 
         except Exception as e:
             logger = logging.getLogger('voice_assistant')
             logger.error(f"Failed to tail log: {e}")
-            return []
\ No newline at end of file
+            return []
+
+
+# Registered once per process rather than once per service
+atexit.register(LoggingService._shutdown_active)
@@ -2,13 +2,30 @@
 Speech recognition service implementation.
 """
 
+import math
+import queue
+import threading
+import time
 import speech_recognition as sr
-from typing import Optional
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
 import logging
 
 from ..core.exceptions import SpeechRecognitionError
 from ..config.settings import ConfigManager
 
+# Seconds the enumerated microphone names are reused
+_MIC_NAMES_TTL = 30.0
+
+# Recorded phrases waiting for recognition while capture runs in the background
+_AUDIO_QUEUE_SIZE = 2
+
+# Recalibration is skipped while a short probe's RMS stays this close to the last one
+_AMBIENT_PROBE_SECONDS = 0.05
+_AMBIENT_RMS_TOLERANCE = 0.2
+
 
 class SpeechRecognitionService:
     """Service for handling speech recognition functionality."""
@@ -20,50 +37,203 @@ class SpeechRecognitionService:
         # Initialize speech recognition components
         self.recognizer = sr.Recognizer()
         self.microphone: Optional[sr.Microphone] = None
+        self._mic_source: Optional[sr.AudioSource] = None
+        # Held while reading the device; PyAudio streams are not thread-safe
+        self._device_lock = threading.Lock()
+        self._audio_queue: "queue.Queue[Union[sr.AudioData, Exception]]" = queue.Queue(maxsize=_AUDIO_QUEUE_SIZE)
+        self._capture_stop = threading.Event()
+        self._capture_executor: Optional[ThreadPoolExecutor] = None
+        self._capture_future: Optional[Future] = None
+        self._mic_ok = False
+        self._calibrated = False
+        self._last_calibration_rms: Optional[float] = None
+        self._mic_names_cache: Optional[list] = None
+        self._mic_names_ts = 0.0
         
-        self._initialize_microphone()
+        self.refresh_settings_cache()
+        self._open_microphone()
+    
+    def refresh_settings_cache(self) -> None:
+        """Copy the listen settings from config; call again after a config reload."""
+        settings = self.config_manager.config.settings
+        self._timeout = settings.speech_timeout
+        self._phrase_limit = settings.phrase_time_limit
+        self._language = settings.language
     
-    def _initialize_microphone(self) -> None:
-        """Initialize microphone and adjust for ambient noise."""
+    def _open_microphone(self) -> None:
+        """Create the microphone; ambient noise calibration is deferred to the first listen."""
         try:
             self.microphone = sr.Microphone()
-            
-            # Adjust microphone for ambient noise
-            with self.microphone as source:
-                self.logger.info("Adjusting microphone for ambient noise...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=2)
-                
+            self._mic_ok = True
             self.logger.info("Speech recognition service initialized successfully")
             
         except Exception as e:
+            self._mic_ok = False
             self.logger.error(f"Failed to initialize microphone: {e}")
             raise SpeechRecognitionError(f"Microphone initialization failed: {e}")
     
-    def listen_for_command(self) -> Optional[str]:
-        """Listen for voice commands and return recognized text."""
+    def open_stream(self) -> None:
+        """Keep the microphone stream open across listens until ``close_stream``."""
         if not self.microphone:
             raise SpeechRecognitionError("Microphone not initialized")
+        if self._mic_source is not None:
+            return
         
         try:
-            settings = self.config_manager.config.settings
+            self._mic_source = self.microphone.__enter__()
+            self.logger.debug("Microphone stream opened")
+        except Exception as e:
+            raise SpeechRecognitionError(f"Failed to open microphone stream: {e}")
+    
+    def close_stream(self) -> None:
+        """Close a stream opened by ``open_stream``."""
+        if self._mic_source is None:
+            return
+        
+        self._mic_source = None
+        try:
+            self.microphone.__exit__(None, None, None)
+            self.logger.debug("Microphone stream closed")
+        except Exception as e:
+            self.logger.error(f"Failed to close microphone stream: {e}")
+    
+    def start_capture(self) -> None:
+        """Record phrases on a background thread while earlier ones are recognized.
+        
+        ``listen_for_command`` then takes recorded audio from a small queue, so
+        the recognition round-trip overlaps with capturing the next phrase.
+        """
+        if not self.microphone:
+            raise SpeechRecognitionError("Microphone not initialized")
+        if self._capture_future is not None:
+            return
+        
+        self._calibrate_if_needed()
+        self._spawn_capture()
+    
+    def _spawn_capture(self) -> None:
+        """Start the capture thread."""
+        self._capture_stop.clear()
+        self._capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mic-capture")
+        self._capture_future = self._capture_executor.submit(self._capture_loop)
+    
+    def stop_capture(self) -> None:
+        """Stop background capture and drop any audio not yet recognized."""
+        if self._capture_future is None:
+            return
+        
+        self._capture_stop.set()
+        self._capture_executor.shutdown(wait=True)
+        self._capture_executor = None
+        self._capture_future = None
+        
+        while True:
+            try:
+                self._audio_queue.get_nowait()
+            except queue.Empty:
+                break
+    
+    @contextmanager
+    def _capture_paused(self) -> Iterator[None]:
+        """Stop background capture for the block and restart it afterwards.
+        
+        The device lock alone could keep the capture thread, which re-takes it
+        right after each listen, ahead of the caller indefinitely.
+        """
+        if self._capture_future is None:
+            yield
+            return
+        
+        self.stop_capture()
+        try:
+            yield
+        finally:
+            self._spawn_capture()
+    
+    def _capture_loop(self) -> None:
+        """Record phrases until stopped; errors are queued for the consumer to raise."""
+        stop = self._capture_stop
+        while not stop.is_set():
+            try:
+                with self._source() as source:
+                    item = self.recognizer.listen(
+                        source,
+                        timeout=self._timeout,
+                        phrase_time_limit=self._phrase_limit
+                    )
+            except sr.WaitTimeoutError:
+                continue
+            except Exception as e:
+                item = e
+            
+            # Bounded put so a stalled consumer does not block stop_capture
+            while not stop.is_set():
+                try:
+                    self._audio_queue.put(item, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
             
-            with self.microphone as source:
+            if isinstance(item, Exception):
+                # Do not spin on a broken device
+                stop.wait(1.0)
+    
+    def _next_audio(self) -> Optional[sr.AudioData]:
+        """Record the next phrase, or take it from the capture queue when capture runs."""
+        if self._capture_future is None:
+            with self._source() as source:
                 self.logger.debug("Listening for command...")
                 
                 # Listen for audio with configured timeout
-                audio = self.recognizer.listen(
+                return self.recognizer.listen(
                     source,
-                    timeout=settings.speech_timeout,
-                    phrase_time_limit=settings.phrase_time_limit
+                    timeout=self._timeout,
+                    phrase_time_limit=self._phrase_limit
                 )
+        
+        try:
+            item = self._audio_queue.get(timeout=self._timeout)
+        except queue.Empty:
+            return None
+        if isinstance(item, Exception):
+            raise item
+        return item
+    
+    @contextmanager
+    def _source(self) -> Iterator[sr.AudioSource]:
+        """Yield the open stream, or open the microphone just for this block.
+        
+        The device lock is held for the whole block.
+        """
+        with self._device_lock:
+            if self._mic_source is not None:
+                yield self._mic_source
+            else:
+                with self.microphone as source:
+                    yield source
+    
+    def _calibrate_if_needed(self) -> None:
+        """Adjust for ambient noise once, unless ``calibrate_microphone`` already did."""
+        if not self._calibrated:
+            self.calibrate_microphone(duration=2.0)
+    
+    def listen_for_command(self) -> Optional[str]:
+        """Listen for voice commands and return recognized text."""
+        if not self.microphone:
+            raise SpeechRecognitionError("Microphone not initialized")
+        
+        self._calibrate_if_needed()
+        
+        try:
+            audio = self._next_audio()
+            if audio is None:
+                self.logger.debug("Speech recognition timeout")
+                return None
             
             # Recognize speech using Google Speech Recognition
-            command = self.recognizer.recognize_google(
-                audio,
-                language=settings.language
-            )
+            command = self.recognizer.recognize_google(audio, language=self._language)
             
-            self.logger.info(f"Command recognized: {command}")
+            self.logger.info("Command recognized: %s", command)
             return command.lower().strip()
             
         except sr.WaitTimeoutError:
@@ -84,24 +254,41 @@ class SpeechRecognitionService:
             raise SpeechRecognitionError(f"Unexpected speech recognition error: {e}")
     
     def test_microphone(self) -> bool:
-        """Test if microphone is working properly."""
+        """Check whether the microphone last initialized, calibrated or deep-tested successfully.
+        
+        This does not touch the device; use ``deep_test_microphone`` to probe it.
+        """
+        return self._mic_ok
+    
+    def deep_test_microphone(self) -> bool:
+        """Test the microphone by recording briefly (blocks for up to a second).
+        
+        Also updates the flag reported by ``test_microphone``.
+        """
         try:
             if not self.microphone:
                 return False
             
-            with self.microphone as source:
+            with self._capture_paused(), self._source() as source:
                 # Try to listen for a very short duration
                 audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=1)
+                self._mic_ok = True
                 return audio is not None
                 
+        except sr.WaitTimeoutError:
+            # Nothing was said, but the device could be read
+            self._mic_ok = True
+            return False
+            
         except Exception as e:
+            self._mic_ok = False
             self.logger.error(f"Microphone test failed: {e}")
             return False
     
     def get_microphone_info(self) -> dict:
         """Get information about available microphones."""
         try:
-            microphone_list = sr.Microphone.list_microphone_names()
+            microphone_list = self._list_microphone_names()
             return {
                 'available_microphones': microphone_list,
                 'default_microphone': microphone_list[0] if microphone_list else None,
@@ -111,6 +298,18 @@ class SpeechRecognitionService:
             self.logger.error(f"Failed to get microphone info: {e}")
             return {'error': str(e)}
     
+    def _list_microphone_names(self) -> list:
+        """Get the microphone names, enumerating PortAudio at most every few seconds."""
+        now = time.monotonic()
+        if self._mic_names_cache is None or now - self._mic_names_ts >= _MIC_NAMES_TTL:
+            self._mic_names_cache = sr.Microphone.list_microphone_names()
+            self._mic_names_ts = now
+        return list(self._mic_names_cache)
+    
+    def invalidate_microphone_cache(self) -> None:
+        """Forget the cached microphone names, e.g. after a device was plugged in."""
+        self._mic_names_cache = None
+    
     def set_microphone_sensitivity(self, energy_threshold: int) -> None:
         """Set microphone sensitivity."""
         try:
@@ -120,19 +319,53 @@ class SpeechRecognitionService:
             self.logger.error(f"Failed to set microphone sensitivity: {e}")
             raise SpeechRecognitionError(f"Failed to set microphone sensitivity: {e}")
     
+    @staticmethod
+    def _probe_rms(source: sr.AudioSource) -> Optional[float]:
+        """Measure the RMS level of a short 16-bit sample, or None if unsupported."""
+        if getattr(source, 'SAMPLE_WIDTH', None) != 2 or source.stream is None:
+            return None
+        
+        frames = max(1, int(source.SAMPLE_RATE * _AMBIENT_PROBE_SECONDS))
+        samples = array('h', source.stream.read(frames))
+        if not samples:
+            return None
+        return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+    
     def calibrate_microphone(self, duration: float = 2.0) -> None:
-        """Recalibrate microphone for ambient noise."""
+        """Recalibrate microphone for ambient noise.
+        
+        Call this up front to avoid the delay on the first ``listen_for_command``.
+        The full adjustment is skipped when a short probe shows the noise
+        level within 20% of the last calibration.
+        """
         if not self.microphone:
             raise SpeechRecognitionError("Microphone not initialized")
         
         try:
-            with self.microphone as source:
+            with self._capture_paused(), self._source() as source:
+                rms = self._probe_rms(source)
+                last_rms = self._last_calibration_rms
+                # A silent baseline (no reading or RMS 0) always gets a full calibration
+                if (
+                    self._calibrated and rms is not None and last_rms
+                    and abs(rms - last_rms) <= last_rms * _AMBIENT_RMS_TOLERANCE
+                ):
+                    self._mic_ok = True
+                    self.logger.info("Ambient noise unchanged, keeping previous calibration")
+                    return
+                
                 self.logger.info(f"Calibrating microphone for {duration} seconds...")
                 self.recognizer.adjust_for_ambient_noise(source, duration=duration)
                 
+            self._last_calibration_rms = rms
+            self._mic_ok = True
+            self._calibrated = True
             self.logger.info("Microphone calibration completed")
             
         except Exception as e:
+            # Retried by the next listen
+            self._mic_ok = False
+            self._calibrated = False
             self.logger.error(f"Microphone calibration failed: {e}")
             raise SpeechRecognitionError(f"Microphone calibration failed: {e}")
     
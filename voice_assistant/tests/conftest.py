@@ -2,38 +2,63 @@
 Pytest configuration and fixtures.
 """
 
+import copy
+import json
+import logging
+import shutil
+
 import pytest
-import tempfile
-from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import create_autospec
 
 from voice_assistant.config.settings import ConfigManager, Configuration
-from voice_assistant.core.factory import AssistantFactory
+
+# Default configuration serialized once at import, written as-is by fixtures
+_DEFAULT_CONFIG_BYTES = json.dumps(Configuration().to_dict(), indent=2).encode('utf-8')
+
+
+@pytest.fixture(scope="session")
+def default_config_bytes():
+    """JSON bytes of a default Configuration."""
+    return _DEFAULT_CONFIG_BYTES
+
+
+@pytest.fixture(scope="session")
+def temp_config_file(tmp_path_factory, default_config_bytes):
+    """Create a temporary config file shared by the whole test session.
+    
+    Tests that modify the file should use ``isolated_config_file`` instead.
+    """
+    config_path = tmp_path_factory.mktemp("cfg") / "test_config.json"
+    config_path.write_bytes(default_config_bytes)
+    return str(config_path)
 
 
 @pytest.fixture
-def temp_config_file():
-    """Create a temporary config file for testing."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        config_path = Path(temp_dir) / "test_config.json"
-        
-        # Create default configuration
-        config = Configuration()
-        config.save_to_file(str(config_path))
-        
-        yield str(config_path)
+def isolated_config_file(temp_config_file, tmp_path):
+    """Create a per-test copy of the session config file that may be modified."""
+    config_path = tmp_path / "test_config.json"
+    shutil.copy(temp_config_file, config_path)
+    return str(config_path)
 
 
 @pytest.fixture
 def config_manager(temp_config_file):
-    """Create a ConfigManager instance for testing."""
+    """Create a ConfigManager instance for testing.
+    
+    Built per test so in-memory edits do not leak; the session file is only
+    parsed once. Tests that save should use ``isolated_config_file``.
+    """
     return ConfigManager(temp_config_file)
 
 
-@pytest.fixture
-def mock_speech_service():
-    """Create a mock speech recognition service."""
-    mock_service = Mock()
+@pytest.fixture(scope="session")
+def _speech_service_template():
+    """Build the configured speech service mock once per session."""
+    # Imported here so collection does not load speech_recognition
+    from voice_assistant.services.speech_service import SpeechRecognitionService
+    
+    # Autospec so calls that do not match the real service's methods fail
+    mock_service = create_autospec(SpeechRecognitionService, instance=True)
     mock_service.listen_for_command.return_value = None
     mock_service.test_microphone.return_value = True
     mock_service.calibrate_microphone.return_value = None
@@ -50,42 +75,24 @@ def mock_speech_service():
 
 
 @pytest.fixture
-def mock_logging_service():
-    """Create a mock logging service."""
-    mock_service = Mock()
-    mock_logger = Mock()
-    mock_service.get_logger.return_value = mock_logger
-    return mock_service
+def mock_speech_service(_speech_service_template):
+    """Create a mock speech recognition service."""
+    # Deep copy so call records and child mocks are not shared between tests
+    return copy.deepcopy(_speech_service_template)
 
 
-@pytest.fixture
-def assistant_factory(temp_config_file):
-    """Create an AssistantFactory for testing."""
-    return AssistantFactory(temp_config_file)
+@pytest.fixture(scope="session")
+def _logging_service_template():
+    """Build the configured logging service mock once per session."""
+    from voice_assistant.services.logging_service import LoggingService
+    
+    mock_service = create_autospec(LoggingService, instance=True)
+    mock_service.get_logger.return_value = create_autospec(logging.Logger, instance=True)
+    return mock_service
 
 
 @pytest.fixture
-def sample_config_data():
-    """Sample configuration data for testing."""
-    return {
-        "smart_devices": [
-            {
-                "name": "Test Smart Plug",
-                "device_id": "test123",
-                "ip_address": "192.168.1.100",
-                "local_key": "testkey123",
-                "device_type": "outlet"
-            }
-        ],
-        "settings": {
-            "speech_timeout": 5,
-            "phrase_time_limit": 5,
-            "language": "id-ID",
-            "log_level": "INFO",
-            "screenshots_folder": "screenshots"
-        },
-        "application_shortcuts": {
-            "notepad": "notepad.exe",
-            "calculator": "calc.exe"
-        }
-    }
\ No newline at end of file
+def mock_logging_service(_logging_service_template):
+    """Create a mock logging service."""
+    return copy.deepcopy(_logging_service_template)
+
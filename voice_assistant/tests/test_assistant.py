@@ -0,0 +1,106 @@
+"""
+Tests for the VoiceAssistant main loop.
+"""
+
+import logging
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from voice_assistant.core.assistant import VoiceAssistant
+
+
+@pytest.fixture
+def assistant(mock_speech_service, mock_logging_service):
+    """Create a VoiceAssistant on mocked services."""
+    assistant = VoiceAssistant(Mock(), mock_speech_service, Mock(), mock_logging_service)
+    yield assistant
+    assistant.stop()
+    assistant._loop_worker.shutdown()
+
+
+class TestVoiceAssistant:
+    """Test VoiceAssistant class."""
+    
+    def test_restart_reuses_loop_thread(self, assistant, mock_speech_service, mock_logging_service):
+        """Test start_async -> stop -> start_async reruns the loop on the same thread."""
+        loop_threads = []
+        listening = threading.Event()
+        
+        def fake_listen():
+            loop_threads.append(threading.current_thread())
+            listening.set()
+            # Block like a real listen; only the stop event wakes it early
+            assistant._stop_event.wait(5.0)
+            return None
+        
+        mock_speech_service.listen_for_command.side_effect = fake_listen
+        
+        assistant.start_async()
+        assert listening.wait(2.0)
+        
+        started = time.monotonic()
+        assistant.stop()
+        assert time.monotonic() - started < 1.0
+        assert not assistant.running
+        
+        listening.clear()
+        assistant.start_async()
+        assert listening.wait(2.0)
+        assert assistant.running
+        assistant.stop()
+        
+        assert len(set(loop_threads)) == 1
+        assert loop_threads[0] is not threading.current_thread()
+        assert mock_speech_service.start_capture.call_count == 2
+        assert mock_speech_service.stop_capture.call_count == 2
+        mock_logging_service.shutdown.assert_not_called()
+    
+    def test_stop_interrupts_error_pause(self, assistant, mock_speech_service):
+        """Test stop() does not wait out the pause after a failed listen."""
+        failed = threading.Event()
+        
+        def failing_listen():
+            failed.set()
+            raise RuntimeError("device lost")
+        
+        mock_speech_service.listen_for_command.side_effect = failing_listen
+        
+        assistant.start_async()
+        assert failed.wait(2.0)
+        
+        started = time.monotonic()
+        assistant.stop()
+        assert time.monotonic() - started < 0.5
+    
+    def test_reload_config_refreshes_speech_settings(self, assistant, mock_speech_service):
+        """Test reloading the config also refreshes the speech service's cached settings."""
+        assistant.reload_config()
+        
+        assistant.config_manager.load_config.assert_called_once_with(reload=True)
+        mock_speech_service.refresh_settings_cache.assert_called_once_with()
+    
+    def test_command_messages_formatted_only_when_enabled(self, mock_speech_service, mock_logging_service, caplog):
+        """Test per-command log messages skip formatting while INFO is disabled."""
+        logger = logging.getLogger('voice_assistant.test.deferred')
+        mock_logging_service.get_logger.return_value = logger
+        formatted = []
+        
+        class Result:
+            def __str__(self):
+                formatted.append(self)
+                return "result"
+        
+        registry = Mock()
+        registry.execute_command.return_value = Result()
+        assistant = VoiceAssistant(Mock(), mock_speech_service, registry, mock_logging_service)
+        
+        with caplog.at_level(logging.WARNING, logger=logger.name):
+            assistant._process_command_safely("peter test")
+        assert formatted == []
+        
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            assistant._process_command_safely("peter test")
+        assert formatted
+        assert "Command executed successfully: result" in caplog.text
@@ -2,73 +2,125 @@
 Tests for command handlers.
 """
 
+import copy
+import os
+import shutil
+import subprocess
+import sys
+import threading
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-import tempfile
 from pathlib import Path
 
-from voice_assistant.commands.base import CommandRegistry
+from voice_assistant.commands.base import Command, CommandRegistry
 from voice_assistant.commands.browser_commands import BrowserCommand
+from voice_assistant.commands.system_commands import SystemControlCommand, _SharedScheduler, _taskkill
 from voice_assistant.commands.application_commands import ApplicationCommand
+from voice_assistant.commands.smart_device_commands import SmartDeviceCommand
 from voice_assistant.commands.utility_commands import UtilityCommand
-from voice_assistant.config.settings import ConfigManager, Configuration
-from voice_assistant.core.exceptions import CommandExecutionError, ApplicationLaunchError
+from voice_assistant.config.settings import ConfigManager, Configuration, SmartDevice
+from voice_assistant.core.exceptions import CommandExecutionError, ApplicationLaunchError, DeviceConnectionError
+
+
+class MockCommand(Command):
+    """Spec for registry test doubles, so they report the class name MockCommand."""
+    
+    __slots__ = ()
+
+
+@pytest.fixture(scope="session")
+def mock_command_template():
+    """Build the registry test double once per session."""
+    mock_command = Mock(spec=MockCommand, name="MockCommand")
+    mock_command.command_patterns = ("pattern1", "pattern2")
+    mock_command.description = "Test command"
+    return mock_command
+
+
+@pytest.fixture
+def mock_command(mock_command_template):
+    """Create a registry test double."""
+    # Deep copy so call records and child mocks are not shared between tests
+    return copy.deepcopy(mock_command_template)
 
 
 class TestCommandRegistry:
     """Test CommandRegistry class."""
     
-    def test_register_command(self):
+    def test_register_command(self, mock_command):
         """Test registering a command handler."""
         registry = CommandRegistry()
-        mock_command = Mock()
-        mock_command.__class__.__name__ = "MockCommand"
         
         registry.register(mock_command)
         assert mock_command in registry._commands
     
-    def test_unregister_command(self):
+    def test_unregister_command(self, mock_command):
         """Test unregistering a command handler."""
         registry = CommandRegistry()
-        mock_command = Mock()
-        mock_command.__class__.__name__ = "MockCommand"
         
         registry.register(mock_command)
         registry.unregister(mock_command)
         assert mock_command not in registry._commands
     
-    def test_get_handler(self):
+    def test_register_all_builds_dispatch_once(self):
+        """Test bulk registration keeps order and rebuilds the dispatch tables once."""
+        registry = CommandRegistry()
+        browser_command = BrowserCommand()
+        system_command = SystemControlCommand()
+        
+        with patch.object(registry, '_rebuild_dispatch', wraps=registry._rebuild_dispatch) as rebuild:
+            registry.register_all([browser_command, system_command])
+        
+        assert rebuild.call_count == 1
+        assert registry._commands == [browser_command, system_command]
+        assert registry.get_handler("peter buka youtube") is browser_command
+        assert registry.get_handler("peter matikan komputer") is system_command
+    
+    def test_freeze_registry(self):
+        """Test a frozen registry keeps its handlers and rejects changes."""
+        registry = CommandRegistry()
+        browser_command = BrowserCommand()
+        registry.register(browser_command)
+        
+        registry.freeze()
+        
+        assert registry.is_frozen
+        assert registry._commands == (browser_command,)
+        assert registry.get_handler("peter buka youtube") is browser_command
+        with pytest.raises(CommandExecutionError, match="frozen"):
+            registry.unregister(browser_command)
+        with pytest.raises(CommandExecutionError, match="frozen"):
+            registry.register(SystemControlCommand())
+    
+    def test_get_handler(self, mock_command):
         """Test getting appropriate command handler."""
         registry = CommandRegistry()
-        mock_command = Mock()
         mock_command.can_handle.return_value = True
         
         registry.register(mock_command)
-        handler = registry.get_handler("test command")
+        handler = registry.get_handler("peter test command")
         
         assert handler == mock_command
         mock_command.can_handle.assert_called_with("test command")
     
-    def test_get_handler_not_found(self):
+    def test_get_handler_not_found(self, mock_command):
         """Test getting handler when none can handle the command."""
         registry = CommandRegistry()
-        mock_command = Mock()
         mock_command.can_handle.return_value = False
         
         registry.register(mock_command)
-        handler = registry.get_handler("test command")
+        handler = registry.get_handler("peter test command")
         
         assert handler is None
     
-    def test_execute_command_success(self):
+    def test_execute_command_success(self, mock_command):
         """Test successful command execution."""
         registry = CommandRegistry()
-        mock_command = Mock()
         mock_command.can_handle.return_value = True
         mock_command.execute.return_value = "success"
         
         registry.register(mock_command)
-        result = registry.execute_command("test command")
+        result = registry.execute_command("peter test command")
         
         assert result == "success"
         mock_command.execute.assert_called_with("test command", None)
@@ -78,223 +130,628 @@ class TestCommandRegistry:
         registry = CommandRegistry()
         
         with pytest.raises(CommandExecutionError, match="No handler found for command"):
-            registry.execute_command("test command")
+            registry.execute_command("peter test command")
+    
+    def test_dispatch_with_real_handlers(self):
+        """Test dispatching commands through the compiled trigger regex."""
+        registry = CommandRegistry()
+        system_command = SystemControlCommand()
+        browser_command = BrowserCommand()
+        
+        registry.register(system_command)
+        registry.register(browser_command)
+        
+        assert registry.get_handler("peter buka youtube") is browser_command
+        assert registry.get_handler("Peter cari di google cuaca") is browser_command
+        assert registry.get_handler("peter matikan komputer") is system_command
+        assert registry.get_handler("peter timer 5 menit matikan komputer") is system_command
+        assert registry.get_handler("peter tolong buka youtube") is browser_command
+        assert registry.get_handler("peter perintah tidak dikenal") is None
+        assert registry.get_handler("buka youtube") is None
+    
+    def test_prefix_table_uses_leading_words(self):
+        """Test trigger phrases are indexed by their first two words."""
+        registry = CommandRegistry()
+        browser_command = BrowserCommand()
+        
+        registry.register(browser_command)
+        
+        assert registry._prefix_table["buka youtube"] is browser_command
+        assert registry._prefix_table["cari di"] is browser_command
+        
+        registry.unregister(browser_command)
+        assert registry._prefix_table == {}
+    
+    def test_dispatch_trie_merges_shared_prefixes(self):
+        """Test trigger phrases compile to one trie-shaped regex."""
+        registry = CommandRegistry()
+        browser_command = BrowserCommand()
+        utility_command = UtilityCommand(Mock())
+        
+        registry.register(browser_command)
+        registry.register(utility_command)
+        
+        assert "buka\\ (?:youtube" in registry._dispatch_re.pattern
+        assert registry._find_handler("tolong buka website github") is browser_command
+        assert registry._find_handler("coba ambil screenshot") is utility_command
+        assert registry._find_handler("halo apa kabar") is None
+    
+    def test_patterns_prefixed_at_registration(self):
+        """Test wake-word prefixed patterns are precomputed on register."""
+        registry = CommandRegistry(wake_word="halo")
+        registry.register(BrowserCommand())
+        
+        assert registry.patterns == [
+            "halo buka youtube",
+            "halo cari di google *",
+            "halo buka website *"
+        ]
+        assert registry.list_commands()["BrowserCommand"]["patterns"] == registry.patterns
+    
+    def test_list_commands_cached_until_changed(self):
+        """Test command listings are cached and rebuilt after registration changes."""
+        registry = CommandRegistry()
+        registry.register(BrowserCommand())
+        
+        first = registry.list_commands()
+        assert registry.list_commands() == first
+        assert "peter buka youtube" in registry.list_commands_text()
+        
+        # Callers get their own copy; changing it does not touch the cache
+        first["BrowserCommand"]["patterns"].append("peter extra")
+        first.pop("BrowserCommand")
+        assert registry.list_commands()["BrowserCommand"]["patterns"] == registry.patterns
+        assert "peter extra" not in registry.list_commands_text()
+        
+        registry.register(SystemControlCommand())
+        
+        assert "SystemControlCommand" in registry.list_commands()
+        assert "peter matikan komputer" in registry.list_commands_text()
     
-    def test_list_commands(self):
+    def test_list_commands(self, mock_command):
         """Test listing all registered commands."""
         registry = CommandRegistry()
-        mock_command = Mock()
-        mock_command.__class__.__name__ = "MockCommand"
-        mock_command.command_patterns = ["pattern1", "pattern2"]
-        mock_command.description = "Test command"
         
         registry.register(mock_command)
         commands = registry.list_commands()
         
         assert "MockCommand" in commands
-        assert commands["MockCommand"]["patterns"] == ["pattern1", "pattern2"]
+        assert commands["MockCommand"]["patterns"] == ["peter pattern1", "peter pattern2"]
         assert commands["MockCommand"]["description"] == "Test command"
 
 
+class TestSystemControlCommand:
+    """Test SystemControlCommand class."""
+    
+    @patch('voice_assistant.commands.system_commands.subprocess.run')
+    @patch('psutil.process_iter')
+    @patch('voice_assistant.commands.system_commands.os')
+    def test_close_all_applications_windows_batches_taskkill(self, mock_os, mock_iter, mock_run):
+        """Test Windows closes user processes with one taskkill call, skipping system ones."""
+        mock_os.name = 'nt'
+        mock_iter.return_value = [
+            Mock(info={'pid': 10, 'name': 'notepad.exe'}),
+            Mock(info={'pid': 11, 'name': 'explorer.exe'}),
+            Mock(info={'pid': 12, 'name': 'Chrome.exe'})
+        ]
+        
+        mock_run.return_value.returncode = 0
+        
+        result = SystemControlCommand().execute("tutup semua aplikasi")
+        
+        assert result == "Closed 2 applications"
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == ["taskkill", "/F", "/PID", "10", "/PID", "12"]
+    
+    @patch('voice_assistant.commands.system_commands.subprocess.run')
+    @patch('psutil.pid_exists')
+    def test_taskkill_counts_only_terminated_processes(self, mock_pid_exists, mock_run):
+        """Test a partly failed taskkill batch only counts the processes that are gone."""
+        mock_run.return_value.returncode = 128
+        mock_pid_exists.side_effect = lambda pid: pid == 11
+        
+        assert _taskkill([10, 11, 12]) == 2
+        
+        mock_run.return_value.returncode = 0
+        assert _taskkill([10, 11, 12]) == 3
+    
+    def test_shared_scheduler_runs_and_cancels(self):
+        """Test timers share one scheduler thread that runs and cancels events."""
+        scheduler = _SharedScheduler()
+        fired = threading.Event()
+        cancelled = Mock()
+        
+        event = scheduler.enter(60, cancelled)
+        scheduler.enter(0.01, fired.set)
+        scheduler.cancel(event)
+        
+        assert fired.wait(2)
+        cancelled.assert_not_called()
+    
+    @patch('voice_assistant.commands.system_commands._SCHEDULER')
+    def test_schedule_and_cancel_shutdown(self, mock_scheduler):
+        """Test timed shutdown is queued on the shared scheduler and can be cancelled."""
+        command = SystemControlCommand()
+        
+        result = command.execute("timer 5 menit matikan komputer")
+        
+        assert result == "Computer will shutdown in 5 minutes"
+        mock_scheduler.enter.assert_called_once_with(300, command._delayed_shutdown)
+        
+        command.cancel_shutdown_timer()
+        mock_scheduler.cancel.assert_called_once_with(mock_scheduler.enter.return_value)
+        assert command.shutdown_timer is None
+
+
+@pytest.fixture(scope="module")
+def browser_command():
+    """Create one BrowserCommand for the read-only can_handle checks."""
+    return BrowserCommand()
+
+
+@pytest.fixture
+def browser_command_fresh():
+    """Create a BrowserCommand for tests that change its state."""
+    return BrowserCommand()
+
+
 class TestBrowserCommand:
     """Test BrowserCommand class."""
     
-    def test_can_handle_youtube(self):
-        """Test handling YouTube command."""
-        command = BrowserCommand()
-        assert command.can_handle("buka youtube")
-        assert command.can_handle("BUKA YOUTUBE")
-        assert not command.can_handle("invalid command")
-    
-    def test_can_handle_google_search(self):
-        """Test handling Google search command."""
-        command = BrowserCommand()
-        assert command.can_handle("cari di google test")
-        assert not command.can_handle("invalid command")
-    
-    def test_can_handle_website(self):
-        """Test handling website command."""
-        command = BrowserCommand()
-        assert command.can_handle("buka website github")
-        assert not command.can_handle("invalid command")
-    
-    @patch('webbrowser.open')
-    def test_open_youtube(self, mock_open):
-        """Test opening YouTube."""
-        command = BrowserCommand()
-        result = command.execute("buka youtube")
-        
-        mock_open.assert_called_with("https://youtube.com")
-        assert result == "YouTube opened"
-    
-    @patch('webbrowser.open')
-    def test_search_google(self, mock_open):
-        """Test Google search."""
-        command = BrowserCommand()
-        result = command.execute("cari di google python tutorial")
-        
-        mock_open.assert_called_with("https://www.google.com/search?q=python+tutorial")
-        assert "python tutorial" in result
-    
-    @patch('webbrowser.open')
-    def test_open_website_known(self, mock_open):
-        """Test opening known website."""
-        command = BrowserCommand()
-        result = command.execute("buka website github")
-        
-        mock_open.assert_called_with("https://github.com")
-        assert "https://github.com" in result
-    
-    @patch('webbrowser.open')
-    def test_open_website_unknown(self, mock_open):
-        """Test opening unknown website."""
-        command = BrowserCommand()
-        result = command.execute("buka website unknown")
-        
-        mock_open.assert_called_with("https://unknown.com")
-        assert "https://unknown.com" in result
-    
-    def test_add_website_shortcut(self):
+    @pytest.mark.parametrize("command_text,expected", [
+        ("buka youtube", True),
+        ("BUKA YOUTUBE", True),
+        ("cari di google test", True),
+        ("buka website github", True),
+        ("invalid command", False),
+    ])
+    def test_can_handle(self, browser_command, command_text, expected):
+        """Test detecting YouTube, Google search and website commands."""
+        assert browser_command.can_handle(command_text) is expected
+    
+    @pytest.mark.parametrize("command_text,expected_url,expected_result", [
+        ("buka youtube", "https://youtube.com", "YouTube opened"),
+        ("cari di google python tutorial", "https://www.google.com/search?q=python+tutorial", "python tutorial"),
+        # Keywords are URL-encoded
+        ("cari di google harga kopi & teh?", "https://www.google.com/search?q=harga+kopi+%26+teh%3F", "harga kopi & teh?"),
+        ("buka website github", "https://github.com", "https://github.com"),
+        ("buka website unknown", "https://unknown.com", "https://unknown.com"),
+        # Longest shortcut on a word boundary wins, trailing words are ignored
+        ("buka website github sekarang", "https://github.com", "https://github.com"),
+    ])
+    def test_execute_opens_url(self, command_text, expected_url, expected_result):
+        """Test each browser command opens the expected URL."""
+        opener = Mock()
+        command = BrowserCommand(opener=opener)
+        result = command.execute(command_text)
+        
+        opener.assert_called_once_with(expected_url)
+        assert expected_result in result
+    
+    @patch('webbrowser.get')
+    def test_default_opener_reuses_browser(self, mock_get, browser_command_fresh):
+        """Test URLs open in new tabs of one cached browser controller by default."""
+        browser_command_fresh.execute("buka youtube")
+        browser_command_fresh.execute("buka website github")
+        
+        mock_get.assert_called_once()
+        mock_get.return_value.open_new_tab.assert_called_with("https://github.com")
+    
+    def test_add_website_shortcut(self, browser_command_fresh):
         """Test adding website shortcut."""
-        command = BrowserCommand()
+        command = browser_command_fresh
         command.add_website_shortcut("test", "test.com")
         
         assert command.website_shortcuts["test"] == "https://test.com"
+        assert "test" in command._trie
     
-    def test_remove_website_shortcut(self):
+    def test_remove_website_shortcut(self, browser_command_fresh):
         """Test removing website shortcut."""
-        command = BrowserCommand()
+        command = browser_command_fresh
         command.add_website_shortcut("test", "test.com")
         command.remove_website_shortcut("test")
         
         assert "test" not in command.website_shortcuts
+        assert "test" not in command._trie
+        assert "twitter" in command._trie
+
+
+@pytest.fixture(scope="class")
+def application_command(tmp_path_factory, default_config_bytes):
+    """Create an ApplicationCommand with a config file, once per test class."""
+    config_path = tmp_path_factory.mktemp("application") / "test_config.json"
+    config_path.write_bytes(default_config_bytes)
+    return ApplicationCommand(ConfigManager(str(config_path)))
 
 
 class TestApplicationCommand:
     """Test ApplicationCommand class."""
     
-    def setup_method(self):
-        """Setup for each test."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.json"
-            config = Configuration()
-            config.save_to_file(str(config_path))
-            
-            self.config_manager = ConfigManager(str(config_path))
-            self.command = ApplicationCommand(self.config_manager)
-    
-    def test_can_handle(self):
+    def test_config_file_outlives_setup(self, application_command):
+        """Test the backing config file is read rather than replaced by defaults."""
+        config_manager = application_command.config_manager
+        
+        assert Path(config_manager.config_path).is_file()
+        # A missing file would be recreated with the sample devices
+        assert config_manager.config.smart_devices == []
+    
+    def test_can_handle(self, application_command):
         """Test command handling detection."""
-        assert self.command.can_handle("jalankan aplikasi notepad")
-        assert not self.command.can_handle("invalid command")
+        assert application_command.can_handle("jalankan aplikasi notepad")
+        assert not application_command.can_handle("invalid command")
     
+    @patch('voice_assistant.commands.application_commands.os')
     @patch('subprocess.Popen')
-    def test_launch_application_success(self, mock_popen):
+    def test_launch_application_success(self, mock_popen, mock_os, application_command):
         """Test successful application launch."""
-        mock_process = Mock()
-        mock_process.poll.return_value = None  # Process still running
-        mock_popen.return_value = mock_process
+        mock_os.name = 'posix'
         
-        result = self.command.execute("jalankan aplikasi notepad")
+        result = application_command.execute("jalankan aplikasi notepad")
         
         mock_popen.assert_called_once()
+        assert mock_popen.call_args[0][0] == ["notepad.exe"]
         assert "notepad" in result
     
+    @patch('voice_assistant.commands.application_commands.os')
+    def test_launch_application_windows(self, mock_os, application_command):
+        """Test Windows launches through startfile."""
+        mock_os.name = 'nt'
+        
+        application_command.execute("jalankan aplikasi notepad")
+        
+        mock_os.startfile.assert_called_once_with("notepad.exe")
+    
+    @pytest.mark.parametrize("os_name", ["posix", "nt"])
+    @patch('voice_assistant.commands.application_commands.os')
+    @patch('subprocess.Popen')
+    def test_launch_shortcut_with_arguments(self, mock_popen, mock_os, os_name):
+        """Test shortcut arguments are split off the program on every platform."""
+        mock_os.name = os_name
+        config_manager = Mock()
+        config_manager.get_application_command.return_value = "code --new-window"
+        command = ApplicationCommand(config_manager)
+        
+        command.execute("jalankan aplikasi vs code")
+        
+        if os_name == 'nt':
+            mock_os.startfile.assert_called_once_with("code", arguments="--new-window")
+            mock_popen.assert_not_called()
+        else:
+            assert mock_popen.call_args[0][0] == ["code", "--new-window"]
+    
+    @pytest.mark.parametrize("os_name", ["posix", "nt"])
+    @patch('voice_assistant.commands.application_commands.os')
     @patch('subprocess.Popen')
-    def test_launch_application_failure(self, mock_popen):
+    def test_launch_application_failure(self, mock_popen, mock_os, application_command, os_name):
         """Test application launch failure."""
+        mock_os.name = os_name
         mock_popen.side_effect = FileNotFoundError()
+        mock_os.startfile.side_effect = FileNotFoundError()
         
         with pytest.raises(ApplicationLaunchError):
-            self.command.execute("jalankan aplikasi nonexistent")
+            application_command.execute("jalankan aplikasi nonexistent")
     
-    def test_get_executable_name_default(self):
+    def test_get_executable_name_default(self, application_command):
         """Test getting executable name from defaults."""
-        executable = self.command._get_executable_name("notepad")
+        executable = application_command._get_executable_name("notepad")
         assert executable == "notepad.exe"
     
-    def test_get_executable_name_variations(self):
+    def test_get_executable_name_variations(self, application_command):
         """Test getting executable name with variations."""
-        executable = self.command._get_executable_name("vs code")
+        executable = application_command._get_executable_name("vs code")
         assert executable == "code"
     
-    def test_add_application_shortcut(self):
+    def test_add_application_shortcut(self, application_command):
         """Test adding application shortcut."""
-        self.command.add_application_shortcut("test", "test.exe")
+        application_command.add_application_shortcut("test", "test.exe")
         
-        shortcuts = self.command.config_manager.config.application_shortcuts
+        shortcuts = application_command.config_manager.config.application_shortcuts
         assert shortcuts["test"] == "test.exe"
     
-    def test_list_application_shortcuts(self):
+    def test_list_application_shortcuts(self, application_command):
         """Test listing application shortcuts."""
-        shortcuts = self.command.list_application_shortcuts()
+        shortcuts = application_command.list_application_shortcuts()
         
         # Should include both config shortcuts and default apps
         assert "notepad" in shortcuts
         assert shortcuts["notepad"] == "notepad.exe"
+    
+    def test_list_application_shortcuts_config_precedence(self, application_command, monkeypatch):
+        """Test config shortcuts shadow defaults and the view is read-only."""
+        # The command is shared by the class, so undo the override afterwards
+        shortcuts = application_command.config_manager.config.application_shortcuts
+        monkeypatch.setitem(shortcuts, "notepad", "notepad++.exe")
+        
+        shortcuts = application_command.list_application_shortcuts()
+        assert shortcuts["notepad"] == "notepad++.exe"
+        assert shortcuts["calculator"] == "calc.exe"
+        with pytest.raises(TypeError):
+            shortcuts["new"] = "new.exe"
+        
+        snapshot = application_command.list_application_shortcuts(copy=True)
+        assert isinstance(snapshot, dict)
+        assert snapshot["notepad"] == "notepad++.exe"
+
+
+class TestSmartDeviceCommand:
+    """Test SmartDeviceCommand class."""
+    
+    def test_detect_action(self):
+        """Test mapping commands to device actions."""
+        command = SmartDeviceCommand(Mock())
+        
+        assert command._detect_action("nyalakan lampu") == "on"
+        assert command._detect_action("tolong hidupkan lampu kamar") == "on"
+        assert command._detect_action("matikan lampu") == "off"
+        assert command._detect_action("tutup lampu") == "off"
+        assert command._detect_action("buka youtube") is None
+    
+    @patch('voice_assistant.commands.smart_device_commands.tinytuya')
+    def test_tuya_device_reused(self, mock_tinytuya):
+        """Test the TinyTuya connection object is created once per device."""
+        config_manager = Mock()
+        config_manager.config.smart_devices = [
+            SmartDevice(name="lamp", device_id="id1", ip_address="10.0.0.2", local_key="key")
+        ]
+        command = SmartDeviceCommand(config_manager)
+        
+        command._control_device("on")
+        command._control_device("off")
+        
+        mock_tinytuya.OutletDevice.assert_called_once_with("id1", "10.0.0.2", "key")
+        
+        # A failed call drops the cached connection
+        mock_tinytuya.OutletDevice.return_value.turn_on.side_effect = OSError("timeout")
+        with pytest.raises(DeviceConnectionError):
+            command._control_device("on")
+        command._control_device("off")
+        assert mock_tinytuya.OutletDevice.call_count == 2
+    
+    @patch('voice_assistant.commands.smart_device_commands.tinytuya')
+    def test_test_all_devices(self, mock_tinytuya):
+        """Test probing every configured device concurrently."""
+        devices = [
+            SmartDevice(name="lamp", device_id="id1", ip_address="10.0.0.2", local_key="key"),
+            SmartDevice(name="fan", device_id="id2", ip_address="10.0.0.3", local_key="key")
+        ]
+        config_manager = Mock()
+        config_manager.config.smart_devices = devices
+        config_manager.get_device_by_name.side_effect = lambda name: next(
+            device for device in devices if device.name == name
+        )
+        mock_tinytuya.OutletDevice.return_value.status.return_value = {'dps': {'1': True}}
+        command = SmartDeviceCommand(config_manager)
+        
+        assert command.test_all_devices() == {"lamp": True, "fan": True}
+        
+        statuses = list(command.iter_device_statuses())
+        assert sorted(status['device_name'] for status in statuses) == ["fan", "lamp"]
+
+
+@pytest.fixture(scope="class")
+def utility_command(tmp_path_factory, default_config_bytes):
+    """Create a UtilityCommand with a config file, once per test class."""
+    config_path = tmp_path_factory.mktemp("utility") / "test_config.json"
+    config_path.write_bytes(default_config_bytes)
+    return UtilityCommand(ConfigManager(str(config_path)))
 
 
 class TestUtilityCommand:
     """Test UtilityCommand class."""
     
-    def setup_method(self):
-        """Setup for each test."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.json"
-            config = Configuration()
-            config.save_to_file(str(config_path))
-            
-            self.config_manager = ConfigManager(str(config_path))
-            self.command = UtilityCommand(self.config_manager)
-    
-    def test_can_handle(self):
+    @pytest.fixture(autouse=True)
+    def restore_screenshots_folder(self, utility_command):
+        """Undo per-test changes to the shared command's screenshots folder."""
+        settings = utility_command.config_manager.config.settings
+        folder = settings.screenshots_folder
+        yield
+        settings.screenshots_folder = folder
+    
+    @pytest.fixture(autouse=True)
+    def patch_pyautogui(self, mocker):
+        """Stub pyautogui for every test in the class."""
+        # Replaced in sys.modules so the real module, which needs a display, is never imported
+        mock_pyautogui = Mock()
+        mock_pyautogui.screenshot.return_value = Mock()
+        mocker.patch.dict(sys.modules, {"pyautogui": mock_pyautogui})
+        self.mock_screenshot = mock_pyautogui.screenshot
+        self.mock_size = mock_pyautogui.size
+    
+    def test_config_file_outlives_setup(self, utility_command):
+        """Test the backing config file is read rather than replaced by defaults."""
+        config_manager = utility_command.config_manager
+        
+        assert Path(config_manager.config_path).is_file()
+        # A missing file would be recreated with the sample devices
+        assert config_manager.config.smart_devices == []
+    
+    def test_can_handle(self, utility_command):
         """Test command handling detection."""
-        assert self.command.can_handle("ambil screenshot")
-        assert self.command.can_handle("screenshot")
-        assert self.command.can_handle("tangkap layar")
-        assert not self.command.can_handle("invalid command")
+        assert utility_command.can_handle("ambil screenshot")
+        assert utility_command.can_handle("screenshot")
+        assert utility_command.can_handle("tangkap layar")
+        assert not utility_command.can_handle("invalid command")
     
-    @patch('pyautogui.screenshot')
-    def test_take_screenshot_success(self, mock_screenshot):
+    @patch('voice_assistant.commands.utility_commands.mss', None)
+    def test_take_screenshot_success(self, utility_command, tmp_path):
         """Test successful screenshot."""
         # Mock screenshot object with save method
-        mock_image = Mock()
-        mock_screenshot.return_value = mock_image
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Update config to use temp directory
-            self.config_manager.config.settings.screenshots_folder = temp_dir
-            
-            result = self.command.execute("ambil screenshot")
-            
-            mock_screenshot.assert_called_once()
-            mock_image.save.assert_called_once()
-            assert "Screenshot saved" in result
-    
-    @patch('pyautogui.size')
-    def test_get_screen_info(self, mock_size):
+        mock_image = self.mock_screenshot.return_value
+        
+        # Update config to use temp directory
+        utility_command.config_manager.config.settings.screenshots_folder = str(tmp_path)
+        
+        result = utility_command.execute("ambil screenshot")
+        utility_command.wait_for_pending_saves()
+        
+        self.mock_screenshot.assert_called_once()
+        mock_image.save.assert_called_once()
+        assert "Screenshot saved" in result
+    
+    @patch('voice_assistant.commands.utility_commands.mss', None)
+    def test_take_screenshot_recreates_deleted_folder(self, utility_command, tmp_path):
+        """Test a screenshots folder removed while running is created again."""
+        folder = tmp_path / "shots"
+        utility_command.config_manager.config.settings.screenshots_folder = str(folder)
+        utility_command.execute("ambil screenshot")
+        
+        shutil.rmtree(folder)
+        
+        result = utility_command.execute("ambil screenshot")
+        
+        assert "Screenshot saved" in result
+        assert folder.is_dir()
+    
+    @patch('voice_assistant.commands.utility_commands.mss', None)
+    def test_take_screenshot_reports_failed_save(self, utility_command, tmp_path):
+        """Test a screenshot that could not be written is reported as a failure."""
+        utility_command.config_manager.config.settings.screenshots_folder = str(tmp_path)
+        self.mock_screenshot.return_value.save.side_effect = OSError("disk full")
+        
+        with pytest.raises(CommandExecutionError, match="disk full"):
+            utility_command.execute("ambil screenshot")
+    
+    @patch('voice_assistant.commands.utility_commands.mss')
+    def test_capture_with_mss(self, mock_mss, utility_command, tmp_path):
+        """Test mss capture reuses one handle and writes a PNG."""
+        # The command is shared by the class; drop handles from earlier tests
+        utility_command._sct_local = threading.local()
+        sct = mock_mss.mss.return_value
+        sct.monitors = [{'left': 0, 'top': 0, 'width': 1920, 'height': 1080}]
+        
+        mock_mss.tools.to_png.return_value = b"png-bytes"
+        
+        full_path = tmp_path / "full.png"
+        assert utility_command._capture(full_path).result() == len(b"png-bytes")
+        utility_command._capture(tmp_path / "part.png", region=(10, 20, 30, 40)).result()
+        
+        assert full_path.read_bytes() == b"png-bytes"
+        
+        mock_mss.mss.assert_called_once()
+        sct.grab.assert_any_call(sct.monitors[0])
+        sct.grab.assert_called_with({'left': 10, 'top': 20, 'width': 30, 'height': 40})
+        raw = sct.grab.return_value
+        mock_mss.tools.to_png.assert_called_with(raw.rgb, raw.size, level=1)
+    
+    @patch('voice_assistant.commands.utility_commands.mss')
+    def test_capture_with_mss_per_thread(self, mock_mss, utility_command, tmp_path):
+        """Test each worker thread opens its own mss handle."""
+        utility_command._sct_local = threading.local()
+        mock_mss.mss.side_effect = lambda: Mock(monitors=[{}])
+        mock_mss.tools.to_png.return_value = b"png"
+        
+        utility_command._capture(tmp_path / "main.png").result()
+        worker = threading.Thread(
+            target=lambda: utility_command._capture(tmp_path / "worker.png").result()
+        )
+        worker.start()
+        worker.join()
+        utility_command._capture(tmp_path / "again.png").result()
+        
+        assert mock_mss.mss.call_count == 2
+    
+    def test_get_screen_info(self, utility_command):
         """Test getting screen information."""
+        mock_size = self.mock_size
         mock_size.return_value = Mock(width=1920, height=1080)
         
-        info = self.command.get_screen_info()
+        info = utility_command.get_screen_info()
         
         assert info['width'] == 1920
         assert info['height'] == 1080
         assert info['total_pixels'] == 1920 * 1080
+        
+        # Cached until explicitly refreshed
+        assert utility_command.get_screen_info() == info
+        mock_size.assert_called_once()
+        utility_command.get_screen_info(refresh=True)
+        assert mock_size.call_count == 2
     
-    def test_list_screenshots_empty(self):
+    def test_screenshots_path_follows_setting(self, utility_command, tmp_path):
+        """Test the cached screenshots folder is re-resolved when the setting changes."""
+        settings = utility_command.config_manager.config.settings
+        settings.screenshots_folder = str(tmp_path)
+        first = utility_command.screenshots_path
+        assert utility_command.screenshots_path is first
+        
+        settings.screenshots_folder = str(tmp_path / "shots")
+        assert utility_command._output_dir() == tmp_path / "shots"
+        assert (tmp_path / "shots").is_dir()
+    
+    def test_list_screenshots_empty(self, utility_command):
         """Test listing screenshots when none exist."""
-        screenshots = self.command.list_screenshots()
+        screenshots = utility_command.list_screenshots()
         assert screenshots == []
     
-    @patch('pyautogui.screenshot')
-    def test_cleanup_old_screenshots(self, mock_screenshot):
+    def test_cleanup_old_screenshots(self, utility_command, tmp_path):
         """Test cleaning up old screenshots."""
-        mock_image = Mock()
-        mock_screenshot.return_value = mock_image
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            self.config_manager.config.settings.screenshots_folder = temp_dir
-            
-            result = self.command.cleanup_old_screenshots(days_old=0)
-            assert "0 old screenshots" in result
\ No newline at end of file
+        utility_command.config_manager.config.settings.screenshots_folder = str(tmp_path)
+        
+        result = utility_command.cleanup_old_screenshots(days_old=0)
+        assert "0 old screenshots" in result
+    
+    def test_list_and_cleanup_screenshots(self, utility_command, tmp_path):
+        """Test listing newest first and deleting only old screenshots."""
+        utility_command.config_manager.config.settings.screenshots_folder = str(tmp_path)
+        folder = tmp_path
+        
+        old_file = folder / "screenshot_old.png"
+        new_file = folder / "screenshot_new.png"
+        other_file = folder / "notes.txt"
+        for file_path in (old_file, new_file, other_file):
+            file_path.write_bytes(b"png")
+        os.utime(old_file, (1_000_000, 1_000_000))
+        os.utime(other_file, (1_000_000, 1_000_000))
+        
+        screenshots = utility_command.list_screenshots()
+        assert [s['filename'] for s in screenshots] == ["screenshot_new.png", "screenshot_old.png"]
+        assert utility_command.list_screenshots(limit=1)[0]['filename'] == "screenshot_new.png"
+        
+        result = utility_command.cleanup_old_screenshots(days_old=1)
+        
+        assert "1 old screenshots" in result
+        assert not old_file.exists()
+        assert new_file.exists()
+        assert other_file.exists()
+    
+    @patch('voice_assistant.commands.utility_commands._PARALLEL_UNLINK_THRESHOLD', 2)
+    def test_cleanup_old_screenshots_parallel(self, utility_command, tmp_path):
+        """Test large cleanups delete every expired screenshot on the thread pool."""
+        utility_command.config_manager.config.settings.screenshots_folder = str(tmp_path)
+        
+        for index in range(3):
+            file_path = tmp_path / f"screenshot_{index}.png"
+            file_path.write_bytes(b"png")
+            os.utime(file_path, (1_000_000, 1_000_000))
+        
+        result = utility_command.cleanup_old_screenshots(days_old=1)
+        
+        assert "3 old screenshots" in result
+        assert os.listdir(tmp_path) == []
+
+
+class TestLazyImports:
+    """Test the command modules defer their heavy dependencies."""
+    
+    def test_import_defers_heavy_modules(self):
+        """Test importing the command modules leaves pyautogui, psutil and friends unloaded."""
+        heavy = ("pyautogui", "psutil", "tinytuya", "mss", "speech_recognition")
+        code = (
+            "import sys\n"
+            "import voice_assistant.commands.application_commands\n"
+            "import voice_assistant.commands.browser_commands\n"
+            "import voice_assistant.commands.smart_device_commands\n"
+            "import voice_assistant.commands.system_commands\n"
+            "import voice_assistant.commands.utility_commands\n"
+            f"print(','.join(m for m in {heavy!r} if m in sys.modules))"
+        )
+        # A fresh interpreter, since this one may already have them loaded
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parents[2],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        
+        assert result.stdout.strip() == ""
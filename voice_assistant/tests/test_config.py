@@ -2,16 +2,17 @@
 Tests for configuration management.
 """
 
+import copy
 import pytest
 import json
-import tempfile
-from pathlib import Path
+from unittest.mock import patch
 
 from voice_assistant.config.settings import (
     Configuration, 
     ConfigManager, 
     SmartDevice, 
-    AssistantSettings
+    AssistantSettings,
+    _read_config_data
 )
 from voice_assistant.core.exceptions import ConfigurationError
 
@@ -83,165 +84,297 @@ class TestConfiguration:
         assert isinstance(config.settings, AssistantSettings)
         assert config.application_shortcuts == {}
     
-    def test_from_dict_valid(self):
-        """Test creating configuration from valid dictionary."""
-        data = {
-            "smart_devices": [
-                {
-                    "name": "Test Device",
-                    "device_id": "test123",
-                    "ip_address": "192.168.1.100",
-                    "local_key": "testkey123",
-                    "device_type": "light"
+    @pytest.mark.parametrize("payload,expected_name,expected_timeout,ok", [
+        (
+            {
+                "smart_devices": [
+                    {
+                        "name": "Test Device",
+                        "device_id": "test123",
+                        "ip_address": "192.168.1.100",
+                        "local_key": "testkey123",
+                        "device_type": "light"
+                    }
+                ],
+                "settings": {
+                    "speech_timeout": 10,
+                    "language": "en-US"
+                },
+                "application_shortcuts": {
+                    "notepad": "notepad.exe"
                 }
-            ],
-            "settings": {
-                "speech_timeout": 10,
-                "language": "en-US"
             },
-            "application_shortcuts": {
-                "notepad": "notepad.exe"
-            }
-        }
+            "Test Device", 10, True
+        ),
+        (
+            {
+                "smart_devices": [
+                    {
+                        "name": "Test Device",
+                        "device_id": "test123",
+                        "ip_address": "192.168.1.100",
+                        "local_key": "testkey123"
+                    }
+                ],
+                "application_shortcuts": {
+                    "notepad": "notepad.exe"
+                }
+            },
+            "Test Device", 5, True
+        ),
+        (
+            {
+                "smart_devices": [
+                    {
+                        "name": "",  # Invalid empty name
+                        "device_id": "test123",
+                        "ip_address": "192.168.1.100",
+                        "local_key": "testkey123"
+                    }
+                ]
+            },
+            None, None, False
+        ),
+    ])
+    def test_from_dict_to_dict(self, payload, expected_name, expected_timeout, ok):
+        """Test building configuration from a dictionary and converting it back."""
+        if not ok:
+            with pytest.raises(ConfigurationError):
+                Configuration.from_dict(payload)
+            return
         
-        config = Configuration.from_dict(data)
+        config = Configuration.from_dict(payload)
         
         assert len(config.smart_devices) == 1
-        assert config.smart_devices[0].name == "Test Device"
-        assert config.settings.speech_timeout == 10
-        assert config.settings.language == "en-US"
+        assert config.smart_devices[0].name == expected_name
+        assert config.settings.speech_timeout == expected_timeout
         assert config.application_shortcuts["notepad"] == "notepad.exe"
+        
+        data = config.to_dict()
+        
+        assert "smart_devices" in data
+        assert "settings" in data
+        assert "application_shortcuts" in data
+        assert len(data["smart_devices"]) == 1
+        assert data["smart_devices"][0]["name"] == expected_name
     
-    def test_from_dict_invalid(self):
-        """Test creating configuration from invalid dictionary."""
-        data = {
-            "smart_devices": [
-                {
-                    "name": "",  # Invalid empty name
-                    "device_id": "test123",
-                    "ip_address": "192.168.1.100",
-                    "local_key": "testkey123"
-                }
-            ]
-        }
+    def test_to_dict_round_trip(self):
+        """Test every settings field, including the wake word, survives a round trip."""
+        config = Configuration(settings=AssistantSettings(wake_word="jarvis"))
+        
+        data = config.to_dict()
+        
+        assert data["settings"]["wake_word"] == "jarvis"
+        assert Configuration.from_dict(data) == config
+    
+    def test_json_str_round_trip(self):
+        """Test serializing to JSON text and back without touching the disk."""
+        config = Configuration(settings=AssistantSettings(speech_timeout=15))
         
+        restored = Configuration.from_json_str(config.to_json_str())
+        
+        assert restored == config
+        assert restored.settings.speech_timeout == 15
         with pytest.raises(ConfigurationError):
-            Configuration.from_dict(data)
+            Configuration.from_json_str("invalid json content")
     
-    def test_to_dict(self):
-        """Test converting configuration to dictionary."""
-        device = SmartDevice(
+    def test_validate_rechecks_in_place_edits(self):
+        """Test every validate call checks the current values."""
+        config = Configuration()
+        config.validate()
+        
+        config.settings.log_level = "VERBOSE"
+        with pytest.raises(ConfigurationError):
+            config.validate()
+    
+    def test_factory_validation_sees_in_place_edits(self, isolated_config_file):
+        """Test AssistantFactory.validate_configuration reports edits made after loading."""
+        from voice_assistant.core.factory import AssistantFactory
+        
+        factory = AssistantFactory(isolated_config_file)
+        assert factory.validate_configuration()
+        
+        factory.config_manager.config.settings.speech_timeout = 0
+        assert not factory.validate_configuration()
+
+
+@pytest.fixture(scope="session")
+def _config_manager_template(tmp_path_factory):
+    """Load a config with one device and one shortcut once per session."""
+    config = Configuration(
+        smart_devices=[SmartDevice(
             name="Test Device",
             device_id="test123",
             ip_address="192.168.1.100",
             local_key="testkey123"
-        )
-        
-        config = Configuration(
-            smart_devices=[device],
-            application_shortcuts={"notepad": "notepad.exe"}
-        )
-        
-        data = config.to_dict()
-        
-        assert "smart_devices" in data
-        assert "settings" in data
-        assert "application_shortcuts" in data
-        assert len(data["smart_devices"]) == 1
-        assert data["smart_devices"][0]["name"] == "Test Device"
+        )],
+        application_shortcuts={"notepad": "notepad.exe"}
+    )
+    config_path = tmp_path_factory.mktemp("manager") / "test_config.json"
+    config.save_to_file(str(config_path))
+    
+    manager = ConfigManager(str(config_path))
+    manager.load_config()
+    return manager
+
+
+@pytest.fixture
+def config_manager_ro(_config_manager_template):
+    """The shared template manager, for tests that only read from it."""
+    return _config_manager_template
+
+
+@pytest.fixture
+def config_manager_rw(_config_manager_template, tmp_path):
+    """A private copy of the template manager that saves to its own file."""
+    manager = copy.deepcopy(_config_manager_template)
+    manager.config_path = str(tmp_path / "test_config.json")
+    return manager
 
 
 class TestConfigManager:
     """Test ConfigManager class."""
     
-    def test_config_manager_with_nonexistent_file(self):
+    @pytest.mark.slow
+    def test_config_manager_with_nonexistent_file(self, tmp_path):
         """Test config manager with non-existent file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.json"
-            manager = ConfigManager(str(config_path))
-            
-            # Should create default config
-            assert isinstance(manager.config, Configuration)
-            assert config_path.exists()
-    
-    def test_config_manager_with_valid_file(self):
+        config_path = tmp_path / "test_config.json"
+        manager = ConfigManager(str(config_path))
+        
+        # Should create default config
+        assert isinstance(manager.config, Configuration)
+        assert config_path.exists()
+    
+    @pytest.mark.slow
+    def test_config_manager_with_valid_file(self, tmp_path):
         """Test config manager with valid config file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.json"
-            
-            # Create test config file
-            test_data = {
-                "smart_devices": [],
-                "settings": {"speech_timeout": 3},
-                "application_shortcuts": {}
-            }
-            
-            with open(config_path, 'w') as f:
-                json.dump(test_data, f)
-            
-            manager = ConfigManager(str(config_path))
-            assert manager.config.settings.speech_timeout == 3
-    
-    def test_config_manager_with_invalid_json(self):
+        config_path = tmp_path / "test_config.json"
+        
+        # Create test config file
+        test_data = {
+            "smart_devices": [],
+            "settings": {"speech_timeout": 3},
+            "application_shortcuts": {}
+        }
+        
+        with open(config_path, 'w') as f:
+            json.dump(test_data, f)
+        
+        manager = ConfigManager(str(config_path))
+        assert manager.config.settings.speech_timeout == 3
+    
+    @pytest.mark.slow
+    def test_config_manager_with_invalid_json(self, isolated_config_file):
         """Test config manager with invalid JSON file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.json"
-            
-            # Create invalid JSON file
-            with open(config_path, 'w') as f:
-                f.write("invalid json content")
-            
-            with pytest.raises(ConfigurationError):
-                ConfigManager(str(config_path))
+        # Overwrite with invalid JSON
+        with open(isolated_config_file, 'w') as f:
+            f.write("invalid json content")
+        
+        # The file is read on first access, not in the constructor
+        manager = ConfigManager(isolated_config_file)
+        with pytest.raises(ConfigurationError):
+            manager.config
     
-    def test_save_config(self):
+    @pytest.mark.slow
+    def test_save_config(self, config_manager_rw):
         """Test saving configuration to file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.json"
-            manager = ConfigManager(str(config_path))
-            
-            # Modify config
-            manager.config.settings.speech_timeout = 15
-            manager.save_config()
-            
-            # Load again and verify
-            manager2 = ConfigManager(str(config_path))
-            assert manager2.config.settings.speech_timeout == 15
-    
-    def test_get_device_by_name(self):
+        # Modify config
+        config_manager_rw.config.settings.speech_timeout = 15
+        config_manager_rw.save_config()
+        
+        # Load again and verify
+        manager2 = ConfigManager(config_manager_rw.config_path)
+        assert manager2.config.settings.speech_timeout == 15
+    
+    def test_get_device_by_name(self, config_manager_ro):
         """Test getting device by name."""
-        device = SmartDevice(
+        found_device = config_manager_ro.get_device_by_name("Test Device")
+        
+        assert found_device is not None
+        assert found_device.name == "Test Device"
+        assert found_device.device_id == "test123"
+    
+    def test_get_application_command(self, config_manager_ro):
+        """Test getting application command."""
+        command = config_manager_ro.get_application_command("notepad")
+        
+        assert command == "notepad.exe"
+        assert config_manager_ro.get_application_command("nonexistent") is None
+    
+    @pytest.mark.slow
+    def test_lookup_tables_refresh_after_save(self, tmp_path):
+        """Test name lookups are case-insensitive and rebuilt after saving."""
+        config = Configuration(
+            application_shortcuts={"Notepad": "notepad.exe"}
+        )
+        
+        config_path = tmp_path / "test_config.json"
+        config.save_to_file(str(config_path))
+        
+        manager = ConfigManager(str(config_path))
+        assert manager.get_application_command("NOTEPAD") == "notepad.exe"
+        assert manager.get_device_by_name("Test Device") is None
+        
+        manager.config.application_shortcuts["paint"] = "mspaint.exe"
+        manager.config.smart_devices.append(SmartDevice(
             name="Test Device",
             device_id="test123",
             ip_address="192.168.1.100",
             local_key="testkey123"
-        )
+        ))
+        manager.save_config()
         
-        config = Configuration(smart_devices=[device])
+        assert manager.get_application_command("paint") == "mspaint.exe"
+        assert manager.get_device_by_name("test device").device_id == "test123"
+    
+    @pytest.mark.slow
+    def test_reload_discards_unsaved_edits(self, tmp_path):
+        """Test reloading an unchanged file replaces in-memory edits with its contents."""
+        config_path = tmp_path / "test_config.json"
+        Configuration().save_to_file(str(config_path))
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.json"
-            config.save_to_file(str(config_path))
-            
-            manager = ConfigManager(str(config_path))
-            found_device = manager.get_device_by_name("Test Device")
-            
-            assert found_device is not None
-            assert found_device.name == "Test Device"
-            assert found_device.device_id == "test123"
+        manager = ConfigManager(str(config_path))
+        manager.config.settings.speech_timeout = 30
+        manager.config.application_shortcuts["paint"] = "mspaint.exe"
+        
+        manager.load_config(reload=True)
+        
+        assert manager.config.settings.speech_timeout == 5
+        assert "paint" not in manager.config.application_shortcuts
+        assert manager.get_application_command("paint") is None
     
-    def test_get_application_command(self):
-        """Test getting application command."""
-        config = Configuration(
-            application_shortcuts={"notepad": "notepad.exe"}
-        )
+    @pytest.mark.slow
+    def test_load_config_reuses_unchanged_file(self, tmp_path):
+        """Test reloading an unchanged file skips parsing, while edits are picked up."""
+        config_path = tmp_path / "test_config.json"
+        Configuration(application_shortcuts={"notepad": "notepad.exe"}).save_to_file(str(config_path))
+        
+        manager = ConfigManager(str(config_path))
+        first = manager.config
+        
+        with patch('voice_assistant.config.settings._read_config_data') as mock_read:
+            manager.load_config()
+            other = ConfigManager(str(config_path))
+            assert other.config == first
+            mock_read.assert_not_called()
+        
+        # Each load builds its own objects from the cached parse
+        assert manager.config == first
+        other.config.settings.speech_timeout = 30
+        other.config.application_shortcuts["paint"] = "mspaint.exe"
+        assert manager.config.settings.speech_timeout == 5
+        assert "paint" not in manager.config.application_shortcuts
+        
+        # An explicit reload reads the file even when it looks unchanged
+        with patch(
+            'voice_assistant.config.settings._read_config_data',
+            wraps=_read_config_data
+        ) as mock_read:
+            manager.load_config(reload=True)
+            mock_read.assert_called_once()
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.json"
-            config.save_to_file(str(config_path))
-            
-            manager = ConfigManager(str(config_path))
-            command = manager.get_application_command("notepad")
-            
-            assert command == "notepad.exe"
-            assert manager.get_application_command("nonexistent") is None
\ No newline at end of file
+        # Rewriting the file changes its size, so it is parsed again
+        Configuration(settings=AssistantSettings(speech_timeout=15)).save_to_file(str(config_path))
+        manager.load_config()
+        assert manager.config is not first
+        assert manager.config.settings.speech_timeout == 15
@@ -0,0 +1,210 @@
+"""
+Tests for the logging service.
+"""
+
+import json
+import logging
+import os
+import pytest
+from unittest.mock import Mock, patch
+
+from voice_assistant.config.settings import ConfigManager
+from voice_assistant.services.logging_service import LoggingService
+
+
+@pytest.fixture
+def logging_service(tmp_path):
+    """Create a LoggingService writing to tmp_path, restoring the root logger afterwards."""
+    root_logger = logging.getLogger()
+    saved_handlers = root_logger.handlers[:]
+    saved_level = root_logger.level
+    config_manager = Mock()
+    config_manager.config.settings.log_level = "INFO"
+    
+    service = LoggingService(config_manager, log_dir=str(tmp_path))
+    yield service
+    
+    service.shutdown()
+    for handler in root_logger.handlers[:]:
+        if handler not in saved_handlers:
+            root_logger.removeHandler(handler)
+            handler.close()
+    for handler in saved_handlers:
+        if handler not in root_logger.handlers:
+            root_logger.addHandler(handler)
+    root_logger.setLevel(saved_level)
+
+
+@pytest.fixture
+def tail_service(logging_service, tmp_path):
+    """Point the logging service at an empty directory for tail_log tests."""
+    logging_service.log_dir = tmp_path / "tail"
+    logging_service.log_dir.mkdir()
+    return logging_service
+
+
+def _write_log(service, text):
+    """Write text as the main log file and return its lines as read in full."""
+    log_file = service.log_dir / "voice_assistant.log"
+    log_file.write_bytes(text.encode('utf-8'))
+    return [line.rstrip() for line in text.splitlines()]
+
+
+class TestLoggingService:
+    """Test LoggingService class."""
+    
+    def test_queued_records_reach_file(self, logging_service, tmp_path):
+        """Test records logged through the queue are written to the log file."""
+        assert LoggingService._active is logging_service
+        
+        logging.getLogger('voice_assistant.test').info("queued record")
+        logging_service.shutdown()
+        
+        assert "queued record" in (tmp_path / "voice_assistant.log").read_text(encoding='utf-8')
+    
+    def test_shutdown_attaches_handlers_directly(self, logging_service, tmp_path):
+        """Test records after shutdown still reach the file, without the queue."""
+        logging_service.shutdown()
+        
+        root_logger = logging.getLogger()
+        assert logging_service._queue_handler is None
+        assert all(handler in root_logger.handlers for handler in logging_service._handlers)
+        assert LoggingService._active is None
+        
+        logging.getLogger('voice_assistant.test').info("direct record")
+        assert "direct record" in (tmp_path / "voice_assistant.log").read_text(encoding='utf-8')
+        
+        # A second shutdown is a no-op
+        logging_service.shutdown()
+    
+    def test_new_service_takes_over_listener(self, logging_service, tmp_path):
+        """Test setting up a second service stops the first one's listener."""
+        first_listener = logging_service._listener
+        config_manager = Mock()
+        config_manager.config.settings.log_level = "INFO"
+        
+        second = LoggingService(config_manager, log_dir=str(tmp_path / "second"))
+        try:
+            assert LoggingService._active is second
+            assert logging_service._listener is None
+            assert first_listener._thread is None
+        finally:
+            second.shutdown()
+    
+    def test_set_log_level_persist(self, logging_service):
+        """Test the level is saved to the config file only when persist is set."""
+        config_manager = logging_service.config_manager
+        
+        logging_service.set_log_level("debug")
+        assert config_manager.config.settings.log_level == "DEBUG"
+        assert logging.getLogger().level == logging.DEBUG
+        config_manager.save_config.assert_not_called()
+        
+        logging_service.set_log_level("warning", persist=True)
+        config_manager.save_config.assert_called_once()
+    
+    def test_set_log_level_without_persist_stays_in_memory(self, logging_service, isolated_config_file):
+        """Test an unpersisted level is dropped by a reload, and a persisted one survives it."""
+        config_manager = ConfigManager(isolated_config_file)
+        logging_service.config_manager = config_manager
+        with open(isolated_config_file, 'rb') as f:
+            original = f.read()
+        
+        logging_service.set_log_level("debug")
+        with open(isolated_config_file, 'rb') as f:
+            assert f.read() == original
+        config_manager.load_config(reload=True)
+        assert config_manager.config.settings.log_level == "INFO"
+        
+        logging_service.set_log_level("warning", persist=True)
+        assert ConfigManager(isolated_config_file).config.settings.log_level == "WARNING"    
+    def test_unknown_level_rejected_everywhere(self, logging_service, tmp_path):
+        """Test every entry point rejects unknown level names the same way."""
+        with pytest.raises(ValueError, match="Unknown log level"):
+            logging_service.set_log_level("verbose")
+        assert logging_service.config_manager.config.settings.log_level == "INFO"
+        
+        with pytest.raises(ValueError, match="Unknown log level"):
+            logging_service.add_file_handler("extra.log", level="verbose")
+        
+        config_manager = Mock()
+        config_manager.config.settings.log_level = "verbose"
+        with pytest.raises(ValueError, match="Unknown log level"):
+            LoggingService(config_manager, log_dir=str(tmp_path / "bad"))
+    
+    def test_get_log_files_returns_plain_dicts(self, logging_service, tmp_path):
+        """Test log file entries are ordinary dicts, newest first."""
+        older = tmp_path / "older.log"
+        older.write_text("old", encoding='utf-8')
+        os.utime(older, (1, 1))
+        
+        log_files = logging_service.get_log_files()
+        
+        assert [info['name'] for info in log_files][-1] == "older.log"
+        assert all(type(info) is dict for info in log_files)
+        assert log_files[-1].get('size_bytes') == 3
+        assert 'modified' in log_files[-1]
+        assert json.loads(json.dumps(log_files)) == log_files
+    
+    def test_cleanup_old_logs(self, logging_service, tmp_path):
+        """Test only log files past the cutoff are deleted, and later listings see it."""
+        logging_service.log_dir = tmp_path / "cleanup"
+        logging_service.log_dir.mkdir()
+        for name in ("old.log", "old.log.1", "recent.log", "old.txt"):
+            (logging_service.log_dir / name).write_text(name, encoding='utf-8')
+        for name in ("old.log", "old.log.1", "old.txt"):
+            os.utime(logging_service.log_dir / name, (1, 1))
+        assert len(logging_service.get_log_files()) == 3
+        
+        assert logging_service.cleanup_old_logs(days_old=30) == 2
+        
+        assert sorted(p.name for p in logging_service.log_dir.iterdir()) == ["old.txt", "recent.log"]
+        assert [info['name'] for info in logging_service.get_log_files()] == ["recent.log"]
+        assert logging_service.cleanup_old_logs(days_old=30) == 0
+
+
+class TestTailLog:
+    """Test LoggingService.tail_log."""
+    
+    def test_missing_file(self, tail_service):
+        """Test a missing log file gives no lines."""
+        assert tail_service.tail_log() == []
+    
+    @pytest.mark.parametrize("block_size", [4, 16, 8192])
+    def test_block_doubling(self, tail_service, block_size):
+        """Test the read block grows until it holds enough lines."""
+        expected = _write_log(tail_service, "".join(f"line {i}\n" for i in range(200)))
+        
+        with patch('voice_assistant.services.logging_service._TAIL_BLOCK_SIZE', block_size):
+            assert tail_service.tail_log(50) == expected[-50:]
+            assert tail_service.tail_log(1) == expected[-1:]
+    
+    def test_no_trailing_newline(self, tail_service):
+        """Test the last line counts even without a newline after it."""
+        expected = _write_log(tail_service, "first\nsecond\nthird")
+        
+        with patch('voice_assistant.services.logging_service._TAIL_BLOCK_SIZE', 4):
+            assert tail_service.tail_log(2) == expected[-2:] == ["second", "third"]
+    
+    def test_more_lines_than_file(self, tail_service):
+        """Test asking for more lines than exist returns the whole file."""
+        expected = _write_log(tail_service, "one\ntwo\nthree\n")
+        
+        with patch('voice_assistant.services.logging_service._TAIL_BLOCK_SIZE', 4):
+            assert tail_service.tail_log(10) == expected
+    
+    @pytest.mark.parametrize("lines", [0, -3])
+    def test_non_positive_lines_returns_whole_file(self, tail_service, lines):
+        """Test lines <= 0 returns the whole file, like slicing with [-0:]."""
+        expected = _write_log(tail_service, "one\ntwo\nthree\n")
+        
+        assert tail_service.tail_log(lines) == expected
+    
+    @pytest.mark.parametrize("block_size", range(1, 12))
+    def test_multibyte_split_at_block_start(self, tail_service, block_size):
+        """Test a UTF-8 character cut by the block start never reaches the result."""
+        expected = _write_log(tail_service, "caf\u00e9 \u00e9t\u00e9\n\u00e9\u00e8\n\u00fc\u00f1\u00ee\n")
+        
+        with patch('voice_assistant.services.logging_service._TAIL_BLOCK_SIZE', block_size):
+            assert tail_service.tail_log(2) == expected[-2:]
+            assert tail_service.tail_log(3) == expected
@@ -0,0 +1,234 @@
+"""
+Tests for the speech recognition service.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+import speech_recognition as sr
+
+from voice_assistant.core.exceptions import SpeechRecognitionError
+from voice_assistant.services.speech_service import SpeechRecognitionService
+
+
+@pytest.fixture
+def speech_service(config_manager):
+    """Create a SpeechRecognitionService on a mocked microphone."""
+    with patch('voice_assistant.services.speech_service.sr.Microphone', MagicMock()):
+        service = SpeechRecognitionService(config_manager)
+    yield service
+    service.stop_capture()
+
+
+class TestSpeechRecognitionService:
+    """Test SpeechRecognitionService class."""
+    
+    def test_calibration_pauses_capture(self, speech_service):
+        """Test calibrating never reads the device while the capture thread does."""
+        reading = threading.Lock()
+        overlaps = []
+        listening = threading.Event()
+        
+        def fake_listen(source, timeout=None, phrase_time_limit=None):
+            if not reading.acquire(blocking=False):
+                overlaps.append("listen")
+                raise sr.WaitTimeoutError()
+            listening.set()
+            time.sleep(0.01)
+            reading.release()
+            raise sr.WaitTimeoutError()
+        
+        def fake_adjust(source, duration=1):
+            if not reading.acquire(blocking=False):
+                overlaps.append("calibrate")
+                return
+            time.sleep(0.01)
+            reading.release()
+        
+        recognizer = speech_service.recognizer
+        with patch.object(recognizer, 'listen', side_effect=fake_listen), \
+                patch.object(recognizer, 'adjust_for_ambient_noise', side_effect=fake_adjust) as mock_adjust:
+            speech_service.start_capture()
+            assert listening.wait(2.0)
+            
+            speech_service.calibrate_microphone(duration=0.1)
+            
+            # Capture is running again after the calibration
+            listening.clear()
+            assert listening.wait(2.0)
+            speech_service.stop_capture()
+        
+        assert mock_adjust.call_count == 2
+        assert overlaps == []
+    
+    def _calibrate_with_rms(self, speech_service, rms):
+        """Calibrate with the ambient probe reading ``rms``; return whether it adjusted."""
+        with patch.object(speech_service, '_probe_rms', return_value=rms), \
+                patch.object(speech_service.recognizer, 'adjust_for_ambient_noise') as mock_adjust:
+            speech_service.calibrate_microphone(duration=0.1)
+        return mock_adjust.called
+    
+    def test_first_calibration_always_adjusts(self, speech_service):
+        """Test the first calibration runs in full when there is no previous RMS."""
+        assert speech_service._last_calibration_rms is None
+        
+        assert self._calibrate_with_rms(speech_service, 100.0)
+        assert speech_service._last_calibration_rms == 100.0
+    
+    @pytest.mark.parametrize("rms, adjusted", [
+        (100.0, False),
+        (120.0, False),
+        (80.0, False),
+        (120.5, True),
+        (79.5, True),
+        (None, True),
+    ])
+    def test_calibration_skipped_within_tolerance(self, speech_service, rms, adjusted):
+        """Test a probe within 20% of the last RMS, boundary included, skips the adjustment."""
+        assert self._calibrate_with_rms(speech_service, 100.0)
+        
+        assert self._calibrate_with_rms(speech_service, rms) is adjusted
+        assert speech_service.test_microphone()
+    
+    @pytest.mark.parametrize("rms", [0.0, 5.0])
+    def test_zero_previous_rms_forces_calibration(self, speech_service, rms):
+        """Test a previous RMS of 0 is never used as the reference level."""
+        assert self._calibrate_with_rms(speech_service, 0.0)
+        
+        assert self._calibrate_with_rms(speech_service, rms)
+    
+    def test_settings_cache_refresh(self, speech_service, monkeypatch):
+        """Test listens use the cached settings until refresh_settings_cache is called."""
+        settings = speech_service.config_manager.config.settings
+        monkeypatch.setattr(speech_service, '_calibrated', True)
+        recognizer = speech_service.recognizer
+        
+        with patch.object(recognizer, 'listen', return_value=MagicMock()) as mock_listen, \
+                patch.object(recognizer, 'recognize_google', return_value="Hello") as mock_recognize:
+            monkeypatch.setattr(settings, 'language', "en-US")
+            monkeypatch.setattr(settings, 'speech_timeout', 3)
+            assert speech_service.listen_for_command() == "hello"
+            assert mock_recognize.call_args.kwargs['language'] != "en-US"
+            assert mock_listen.call_args.kwargs['timeout'] != 3
+            
+            speech_service.refresh_settings_cache()
+            speech_service.listen_for_command()
+            assert mock_recognize.call_args.kwargs['language'] == "en-US"
+            assert mock_listen.call_args.kwargs['timeout'] == 3
+    
+    def test_microphone_flag_follows_device_checks(self, speech_service):
+        """Test the cached test_microphone result is updated by calibration and deep tests."""
+        assert speech_service.test_microphone()
+        recognizer = speech_service.recognizer
+        
+        with patch.object(recognizer, 'listen', side_effect=OSError("device unplugged")):
+            assert not speech_service.deep_test_microphone()
+        assert not speech_service.test_microphone()
+        
+        with patch.object(recognizer, 'listen', side_effect=sr.WaitTimeoutError()):
+            assert not speech_service.deep_test_microphone()
+        assert speech_service.test_microphone()
+        
+        with patch.object(recognizer, 'adjust_for_ambient_noise', side_effect=OSError("device unplugged")):
+            with pytest.raises(SpeechRecognitionError):
+                speech_service.calibrate_microphone(duration=0.1)
+        assert not speech_service.test_microphone()
+        
+        with patch.object(recognizer, 'listen', return_value=MagicMock()):
+            assert speech_service.deep_test_microphone()
+        assert speech_service.test_microphone()
+    
+    def test_microphone_names_cache(self, speech_service):
+        """Test microphone names are re-enumerated after the TTL or an explicit invalidation."""
+        with patch('voice_assistant.services.speech_service.sr.Microphone.list_microphone_names',
+                   side_effect=[["Mic A"], ["Mic A", "Mic B"], ["Mic C"]]) as mock_list, \
+                patch('voice_assistant.services.speech_service.time.monotonic', return_value=1000.0) as mock_clock:
+            assert speech_service.get_microphone_info()['available_microphones'] == ["Mic A"]
+            
+            # Within the TTL the cached names are returned, and callers get their own copy
+            mock_clock.return_value = 1029.0
+            info = speech_service.get_microphone_info()
+            info['available_microphones'].append("changed")
+            assert speech_service.get_microphone_info()['available_microphones'] == ["Mic A"]
+            assert mock_list.call_count == 1
+            
+            mock_clock.return_value = 1030.0
+            assert speech_service.get_microphone_info()['total_count'] == 2
+            
+            speech_service.invalidate_microphone_cache()
+            assert speech_service.get_microphone_info()['default_microphone'] == "Mic C"
+            assert mock_list.call_count == 3
+    
+    def test_calibration_deferred_to_first_listen(self, speech_service):
+        """Test only the first listen calibrates, and a failed calibration is retried."""
+        recognizer = speech_service.recognizer
+        
+        with patch.object(recognizer, 'listen', side_effect=sr.WaitTimeoutError()), \
+                patch.object(recognizer, 'adjust_for_ambient_noise') as mock_adjust:
+            mock_adjust.side_effect = OSError("device busy")
+            with pytest.raises(SpeechRecognitionError):
+                speech_service.listen_for_command()
+            assert not speech_service._calibrated
+            
+            mock_adjust.side_effect = None
+            assert speech_service.listen_for_command() is None
+            assert speech_service.listen_for_command() is None
+            assert mock_adjust.call_count == 2
+            
+            # A failed explicit recalibration makes the next listen calibrate again
+            mock_adjust.side_effect = OSError("device busy")
+            with pytest.raises(SpeechRecognitionError):
+                speech_service.calibrate_microphone(duration=0.1)
+            mock_adjust.side_effect = None
+            speech_service.listen_for_command()
+            assert mock_adjust.call_count == 4
+            assert speech_service._calibrated
+    
+    def test_explicit_calibration_skips_listen_calibration(self, speech_service):
+        """Test calibrating up front means the first listen does not calibrate."""
+        recognizer = speech_service.recognizer
+        
+        with patch.object(recognizer, 'listen', side_effect=sr.WaitTimeoutError()), \
+                patch.object(recognizer, 'adjust_for_ambient_noise') as mock_adjust:
+            speech_service.calibrate_microphone(duration=0.1)
+            speech_service.listen_for_command()
+        
+        mock_adjust.assert_called_once()
+    
+    def test_open_stream_reused_until_closed(self, speech_service, monkeypatch):
+        """Test listens share the open stream and reopen the device per listen once it is closed."""
+        monkeypatch.setattr(speech_service, '_calibrated', True)
+        microphone = speech_service.microphone
+        
+        with patch.object(speech_service.recognizer, 'listen', side_effect=sr.WaitTimeoutError()) as mock_listen:
+            speech_service.open_stream()
+            speech_service.open_stream()
+            speech_service.listen_for_command()
+            speech_service.listen_for_command()
+            assert microphone.__enter__.call_count == 1
+            assert all(c.args[0] is microphone.__enter__.return_value for c in mock_listen.call_args_list)
+            
+            speech_service.close_stream()
+            speech_service.close_stream()
+            assert microphone.__exit__.call_count == 1
+            
+            speech_service.listen_for_command()
+            assert microphone.__enter__.call_count == 2
+            assert microphone.__exit__.call_count == 2
+    
+    def test_stream_state_cleared_on_errors(self, speech_service):
+        """Test a failed open or close leaves no stale stream behind."""
+        microphone = speech_service.microphone
+        
+        microphone.__enter__.side_effect = OSError("device busy")
+        with pytest.raises(SpeechRecognitionError):
+            speech_service.open_stream()
+        assert speech_service._mic_source is None
+        
+        microphone.__enter__.side_effect = None
+        microphone.__exit__.side_effect = OSError("device gone")
+        speech_service.open_stream()
+        speech_service.close_stream()
+        assert speech_service._mic_source is None